@@ -109,7 +109,7 @@ def rebuild_language(output_dir: Optional[Path] = None):
     
     This is the PRIMARY law - everything else is drift.
     """
-    from .rosetta_archaeologist import build_canon
+    from .rosetta_archaeologist import build_canon, dump_yaml
     
     codecraft_root = get_codecraft_root()
     output = output_dir or get_output_dir()
@@ -133,9 +133,8 @@ def rebuild_language(output_dir: Optional[Path] = None):
     canon = build_canon(codecraft_root, args)
     
     # Write to output
-    import yaml
     with open(args.out, 'w', encoding='utf-8', newline='\n') as f:
-        yaml.safe_dump(canon, f, sort_keys=False, allow_unicode=True)
+        dump_yaml(canon, f)
     
     print(f"    ✅ Wrote {args.out}")
     
@@ -19,9 +19,10 @@ Output:
 import sys
 import os
 import hashlib
+from collections import Counter
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 try:
     import yaml
@@ -29,16 +30,27 @@ except ImportError:
     print("ERROR: PyYAML is required. Install with: pip install pyyaml")
     sys.exit(2)
 
+# Prefer the libyaml C bindings when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
 # ═══════════════════════════════════════════════════════════════════════════
 # UTILITY FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════
 
 def sha256_file(path: Path) -> str:
     """Compute SHA-256 hash of file contents."""
-    h = hashlib.sha256()
     with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(65536), b""):
-            h.update(chunk)
+        # Python 3.11+: chunk loop runs in C
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        buf = bytearray(65536)
+        view = memoryview(buf)
+        while n := f.readinto(buf):
+            h.update(view[:n])
     return h.hexdigest()
 
 def sha256_text(text: str) -> str:
@@ -49,36 +61,39 @@ def sha256_text(text: str) -> str:
 # LOCK BUILDER
 # ═══════════════════════════════════════════════════════════════════════════
 
-def validate_executor(executor: Dict[str, Any], idx: int) -> bool:
-    """Validate executor structure."""
+def _executor_error(executor: Dict[str, Any], idx: int) -> Optional[str]:
+    """Return the first validation error for an executor, or None if valid."""
     required_fields = ["id", "tier", "description", "bridge", "jurisdiction", "capabilities", "guardrails"]
     
     for field in required_fields:
         if field not in executor:
-            print(f"  ✗ ERROR: Executor #{idx} missing required field: {field}")
-            return False
+            return f"  ✗ ERROR: Executor #{idx} missing required field: {field}"
     
     # Validate tier format (T1, T2, T3)
     tier = executor["tier"]
     if not isinstance(tier, str) or tier not in ["T1", "T2", "T3"]:
-        print(f"  ✗ ERROR: Executor '{executor['id']}' has invalid tier: {tier} (must be T1, T2, or T3)")
-        return False
+        return f"  ✗ ERROR: Executor '{executor['id']}' has invalid tier: {tier} (must be T1, T2, or T3)"
     
     # Validate jurisdiction is a list
     if not isinstance(executor["jurisdiction"], list):
-        print(f"  ✗ ERROR: Executor '{executor['id']}' jurisdiction must be a list")
-        return False
+        return f"  ✗ ERROR: Executor '{executor['id']}' jurisdiction must be a list"
     
     # Validate capabilities is a list
     if not isinstance(executor["capabilities"], list):
-        print(f"  ✗ ERROR: Executor '{executor['id']}' capabilities must be a list")
-        return False
+        return f"  ✗ ERROR: Executor '{executor['id']}' capabilities must be a list"
     
     # Validate guardrails is a list
     if not isinstance(executor["guardrails"], list):
-        print(f"  ✗ ERROR: Executor '{executor['id']}' guardrails must be a list")
-        return False
+        return f"  ✗ ERROR: Executor '{executor['id']}' guardrails must be a list"
     
+    return None
+
+def validate_executor(executor: Dict[str, Any], idx: int) -> bool:
+    """Validate executor structure."""
+    error = _executor_error(executor, idx)
+    if error:
+        print(error)
+        return False
     return True
 
 def build_executors_lock(source_path: Path, output_path: Path):
@@ -92,7 +107,7 @@ def build_executors_lock(source_path: Path, output_path: Path):
     
     # Load source YAML
     with open(source_path, "r", encoding="utf-8") as f:
-        source_data = yaml.safe_load(f)
+        source_data = yaml.load(f, Loader=_Loader)
     
     if not source_data:
         print("ERROR: Source file is empty or invalid YAML")
@@ -111,19 +126,28 @@ def build_executors_lock(source_path: Path, output_path: Path):
     print(f"Found {len(executors)} executors")
     print()
     
-    # Validate all executors
+    # Validate all executors (progress lines written in one batch)
     validated_executors = []
+    lines = []
     for idx, executor in enumerate(executors, 1):
-        if validate_executor(executor, idx):
+        error = _executor_error(executor, idx)
+        if error is None:
             validated_executors.append(executor)
-            print(f"  ✓ {executor['id']:15s} (Tier {executor['tier']}, {len(executor['jurisdiction'])} jurisdictions)")
+            lines.append(f"  ✓ {executor['id']:15s} (Tier {executor['tier']}, {len(executor['jurisdiction'])} jurisdictions)")
         else:
-            print(f"  ✗ Validation failed for executor #{idx}")
+            lines.append(error)
+            lines.append(f"  ✗ Validation failed for executor #{idx}")
+            sys.stdout.write("\n".join(lines) + "\n")
             sys.exit(1)
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
     
     # Compute source hash
     source_hash = sha256_file(source_path)
     
+    # Tier breakdown in a single pass
+    tier_counts = Counter(e["tier"] for e in validated_executors)
+    
     # Build lock document
     lock = {
         "schema": "1.0",
@@ -146,35 +170,38 @@ def build_executors_lock(source_path: Path, output_path: Path):
         "statistics": {
             "total_executors": len(validated_executors),
             "tier_breakdown": {
-                "T1": sum(1 for e in validated_executors if e["tier"] == "T1"),
-                "T2": sum(1 for e in validated_executors if e["tier"] == "T2"),
-                "T3": sum(1 for e in validated_executors if e["tier"] == "T3"),
+                "T1": tier_counts["T1"],
+                "T2": tier_counts["T2"],
+                "T3": tier_counts["T3"],
             },
         },
     }
     
     # Write to file
     with open(output_path, "w", encoding="utf-8") as f:
-        yaml.dump(lock, f, sort_keys=False, allow_unicode=True, default_flow_style=False)
+        yaml.dump(lock, f, Dumper=_Dumper, sort_keys=False, allow_unicode=True, default_flow_style=False)
     
     # Summary
-    print("\n" + "="*80)
-    print("✅ RUNTIME LOCK GENERATED")
-    print("="*80)
-    print(f"Output: {output_path}")
-    print(f"\nExecutor Counts by Tier:")
-    print(f"  - Tier 1 (Safe/Sandboxed):        {lock['statistics']['tier_breakdown']['T1']} executors")
-    print(f"  - Tier 2 (Controlled Effects):    {lock['statistics']['tier_breakdown']['T2']} executors")
-    print(f"  - Tier 3 (QEE Governance):        {lock['statistics']['tier_breakdown']['T3']} executors")
-    print(f"\n  TOTAL: {lock['statistics']['total_executors']} executors")
-    print(f"\nSource Hash: {source_hash[:16]}...")
-    print("="*80)
-    print()
-    print("🏛️ TRIPLE-LOCK SOVEREIGNTY COMPLETE")
-    print("   Lock 1: canon.lock.yaml (Language - 20 Arcane Schools)")
-    print("   Lock 2: canon.partitions.lock.yaml (Knowledge - Foundations, Syntax, etc.)")
-    print("   Lock 3: canon.executors.lock.yaml (Runtime - VM Identity & Authority)")
-    print("="*80)
+    tier_breakdown = lock['statistics']['tier_breakdown']
+    sys.stdout.write("\n".join([
+        "\n" + "="*80,
+        "✅ RUNTIME LOCK GENERATED",
+        "="*80,
+        f"Output: {output_path}",
+        f"\nExecutor Counts by Tier:",
+        f"  - Tier 1 (Safe/Sandboxed):        {tier_breakdown['T1']} executors",
+        f"  - Tier 2 (Controlled Effects):    {tier_breakdown['T2']} executors",
+        f"  - Tier 3 (QEE Governance):        {tier_breakdown['T3']} executors",
+        f"\n  TOTAL: {lock['statistics']['total_executors']} executors",
+        f"\nSource Hash: {source_hash[:16]}...",
+        "="*80,
+        "",
+        "🏛️ TRIPLE-LOCK SOVEREIGNTY COMPLETE",
+        "   Lock 1: canon.lock.yaml (Language - 20 Arcane Schools)",
+        "   Lock 2: canon.partitions.lock.yaml (Knowledge - Foundations, Syntax, etc.)",
+        "   Lock 3: canon.executors.lock.yaml (Runtime - VM Identity & Authority)",
+        "="*80,
+    ]) + "\n")
 
 # ═══════════════════════════════════════════════════════════════════════════
 # CLI ENTRYPOINT
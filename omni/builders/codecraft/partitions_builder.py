@@ -6,27 +6,59 @@ Canon architecture:
   - canon.partitions.lock.yaml → Everything else (foundations, syntax, operators, params, examples, migrations)
 
 Usage:
-    python tools/build_partitions_lock.py
+    python tools/build_partitions_lock.py [--format yaml|json|both]
 
 Requirements:
     pip install pyyaml
 
 Output:
     canon.partitions.lock.yaml (in lexicon root)
+    canon.partitions.lock.json (with --format json|both)
 """
 import sys
 import os
 import re
+import json
+import argparse
 import hashlib
+import heapq
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from datetime import datetime, timezone
-from typing import Dict, Any, List
+from datetime import date, datetime, timezone
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
 
+# PyYAML is imported lazily: the front-matter fast path and the native lock
+# emitter cover the common case, so --help and plain imports skip it
+_yaml = None
+_SafeLoader = _SafeDumper = None
+
+def _load_yaml():
+    """Import PyYAML on first use, preferring the libyaml C bindings."""
+    global _yaml, _SafeLoader, _SafeDumper
+    if _yaml is None:
+        import yaml
+        try:
+            from yaml import CSafeLoader as loader, CSafeDumper as dumper
+        except ImportError:
+            from yaml import SafeLoader as loader, SafeDumper as dumper
+        _SafeLoader, _SafeDumper = loader, dumper
+        _yaml = yaml
+    return _yaml
+
+# Optional: orjson for the JSON lock (falls back to stdlib json)
 try:
-    import yaml
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    print("ERROR: PyYAML is required. Install with: pip install pyyaml")
-    sys.exit(2)
+    ORJSON_AVAILABLE = False
+
+def _dumps_json(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes, via orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
 
 # ═══════════════════════════════════════════════════════════════════════════
 # PARTITION MAPPING - Lexicon folders → Partition names
@@ -41,28 +73,182 @@ PARTITION_MAP = {
     "08_MIGRATION":        "migrations",
 }
 
+# Partition name → default document kind (also the lock's partition order)
+_KIND_MAP = {
+    "foundations":      "foundation",
+    "syntax_variants":  "syntax_variant",
+    "parameters":       "parameter",
+    "operators":        "operator",
+    "examples":         "example",
+    "migrations":       "migration",
+}
+
 # ═══════════════════════════════════════════════════════════════════════════
 # UTILITY FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════
 
-def sha256_file(path: Path) -> str:
-    """Compute SHA-256 hash of file contents."""
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(65536), b""):
-            h.update(chunk)
-    return h.hexdigest()
+HASH_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Untouched SHA-256 context; .copy() is cheaper than constructing a new one
+# through OpenSSL's provider lookup. Never update() it - every copy is an
+# independent context, so copying from worker threads is safe.
+_SHA256_PROTO = hashlib.sha256()
+
+# Content hash for entries. The hash is a change-detection key, so faster
+# non-cryptographic algorithms are allowed when their wheel is installed:
+#   sha256 (default, stdlib) | blake3 (pip install blake3) | xxh3_128 (pip install xxhash)
+# sha256 stays the default so every machine produces the same lock.
+HASH_ALGOS = ("sha256", "blake3", "xxh3_128")
+HASH_ALGO = os.getenv("OMNI_PARTITIONS_HASH_ALGO", "sha256")
+
+def new_hasher_factory(hash_algo: str = "sha256") -> Callable[[], Any]:
+    """Return a zero-arg constructor for a hashlib-style (update/hexdigest) hasher."""
+    if hash_algo == "sha256":
+        return _SHA256_PROTO.copy
+    if hash_algo == "blake3":
+        from blake3 import blake3
+        return blake3
+    if hash_algo == "xxh3_128":
+        from xxhash import xxh3_128
+        return xxh3_128
+    raise ValueError(f"Unknown hash algorithm: {hash_algo} (choose from {', '.join(HASH_ALGOS)})")
+
+# Hash manifests hold machine-specific paths and mtimes, so they live in the
+# per-user cache (OMNI_PARTITIONS_CACHE_DIR overrides), never in the checkout
+PARTITIONS_CACHE_DIR = Path(
+    os.getenv("OMNI_PARTITIONS_CACHE_DIR") or Path.home() / ".cache" / "omni" / "partitions_builder"
+)
+
+def hash_manifest_path(output_path: Path) -> Path:
+    """Manifest file for a lock, named after a hash of its absolute path."""
+    digest = hashlib.sha1(str(output_path.resolve()).encode("utf-8")).hexdigest()[:12]
+    return PARTITIONS_CACHE_DIR / f"{output_path.stem}.{digest}.cache.json"
+
+def load_hash_manifest(path: Path) -> Dict[str, List]:
+    """Load the {absolute_path: [size, mtime_ns, digest, hash_algo]} manifest from a previous build."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_hash_manifest(path: Path, manifest: Dict[str, List]):
+    """Atomically write the hash manifest (temp file + os.replace)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+def manifest_digest(path: Path, st: os.stat_result, prev: Dict[str, List],
+                    hash_algo: str = "sha256") -> Optional[str]:
+    """Return prev's digest for path if its size, mtime_ns and algorithm are unchanged."""
+    hit = prev.get(str(path))
+    if (hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns
+            and (hit[3] if len(hit) > 3 else "sha256") == hash_algo):
+        return hit[2]
+    return None
 
 FRONT_MATTER_RE = re.compile(r'^---\s*\n(.*?)\n---\s*\n?', re.DOTALL)
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+# Plain YAML scalars that resolve to themselves as strings (no indicators,
+# no ": " / " #", not a YAML 1.1 bool/null word, not starting with a digit)
+_PLAIN_SCALAR_RE = re.compile(r'^[A-Za-z_/][\w./(), -]*$')
+_RESERVED_SCALARS = frozenset({"y", "n", "yes", "no", "on", "off", "true", "false", "null"})
+
+# Fast-path front-matter: flat "key: scalar" lines only
+_KEY_VAL_RE = re.compile(r'^([A-Za-z_][\w.-]*):(?: +(.*?))? *$')
+_INT_RE = re.compile(r'^[-+]?(?:0|[1-9][0-9]*)$')
+_FLOAT_RE = re.compile(r'^[-+]?[0-9]+\.[0-9]+$')
+
+def _parse_simple_front_matter(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse flat `key: scalar` front-matter without PyYAML.
+    
+    Returns None (caller falls back to YAML) on anything beyond unquoted
+    strings, simple quoted strings, decimal ints/floats and empty values.
+    """
+    data = {}
+    for line in text.split("\n"):
+        m = _KEY_VAL_RE.match(line)
+        if not m or m.group(1).lower() in _RESERVED_SCALARS:
+            return None
+        value = m.group(2)
+        if not value:
+            value = None
+        elif _PLAIN_SCALAR_RE.match(value) and value.lower() not in _RESERVED_SCALARS:
+            pass
+        elif len(value) >= 2 and value[0] == value[-1] == "'" and "'" not in value[1:-1]:
+            value = value[1:-1]
+        elif len(value) >= 2 and value[0] == value[-1] == '"' and not any(c in value[1:-1] for c in '"\\'):
+            value = value[1:-1]
+        elif _INT_RE.match(value):
+            value = int(value)
+        elif _FLOAT_RE.match(value):
+            value = float(value)
+        else:
+            return None
+        data[m.group(1)] = value
+    return data
+
+FRONT_MATTER_SCAN_BYTES = 64 * 1024   # Front-matter always sits at the top...
+FRONT_MATTER_MAX_BYTES = 1 << 20      # ...and never runs past this
 
-def load_front_matter(path: Path) -> Dict[str, Any]:
-    """Extract YAML front-matter from markdown file."""
+def read_and_hash(path: Path, hash_content: bool = True,
+                  new_hasher: Callable[[], Any] = None) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Read a markdown file once, returning (front_matter_text, hex_digest).
+    
+    new_hasher (see new_hasher_factory) defaults to SHA-256.
+    
+    The digest is computed over every chunk while the leading bytes are
+    kept for the front-matter match: collection stops as soon as the file
+    is known not to start with "---", once the closing "---" has been seen
+    (checked every FRONT_MATTER_SCAN_BYTES), or at FRONT_MATTER_MAX_BYTES.
+    With hash_content=False reading stops there too and the digest is None.
+    """
+    h = (new_hasher or _SHA256_PROTO.copy)() if hash_content else None
+    prefix = bytearray()
+    collecting = True
+    with open(path, "rb", buffering=0) as f:
+        chunk_size = HASH_CHUNK_SIZE if h is not None else FRONT_MATTER_SCAN_BYTES
+        buf = bytearray(min(chunk_size, os.fstat(f.fileno()).st_size + 1))
+        view = memoryview(buf)
+        while n := f.readinto(buf):
+            offset = 0
+            while collecting and offset < n:
+                step = min(n - offset, FRONT_MATTER_SCAN_BYTES, FRONT_MATTER_MAX_BYTES - len(prefix))
+                prefix += view[offset:offset + step]
+                offset += step
+                if len(prefix) >= 3 and not prefix.startswith(b"---"):
+                    collecting = False
+                    prefix.clear()
+                elif prefix.find(b"\n---", 3) != -1 or len(prefix) >= FRONT_MATTER_MAX_BYTES:
+                    collecting = False
+            if h is None:
+                if not collecting:
+                    break
+                continue
+            h.update(view[:n])
+    
+    if not prefix.startswith(b"---"):
+        return None, (h.hexdigest() if h is not None else None)
+    text = prefix.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+    m = FRONT_MATTER_RE.match(text)
+    return (m.group(1) if m else None), (h.hexdigest() if h is not None else None)
+
+def parse_front_matter(text: Optional[str], path: Path) -> Dict[str, Any]:
+    """Parse front-matter text (from read_and_hash) into a dict."""
+    if text is None:
+        return {}
     try:
-        text = path.read_text(encoding="utf-8", errors="ignore")
-        m = FRONT_MATTER_RE.match(text)
-        if not m:
-            return {}
-        return yaml.safe_load(m.group(1)) or {}
+        meta = _parse_simple_front_matter(text)
+        if meta is not None:
+            return meta
+        yaml = _load_yaml()
+        return yaml.load(text, Loader=_SafeLoader) or {}
     except Exception as e:
         print(f"WARNING: Failed to parse front-matter in {path}: {e}")
         return {}
@@ -72,19 +258,44 @@ def stem_to_title(stem: str) -> str:
     s = stem.replace("_", " ").replace("-", " ")
     return s.title()
 
+# Lowercased file names iter_md never yields (compared case-insensitively)
+_SKIP_NAMES = frozenset({"readme.md"})
+
+def iter_md(root: Path) -> Iterator[Tuple[str, os.stat_result]]:
+    """
+    Yield (path, stat) for every markdown file under root, skipping README.md.
+    
+    Iterative os.scandir walk (pre-order, like rglob) that only builds
+    strings; callers wrap the survivors in Path.
+    """
+    stack = [str(root)]
+    while stack:
+        subdirs = []
+        with os.scandir(stack.pop()) as it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    subdirs.append(e.path)
+                elif e.name.endswith(".md") and e.name.lower() not in _SKIP_NAMES:
+                    yield e.path, e.stat()
+        stack.extend(reversed(subdirs))
+
 # ═══════════════════════════════════════════════════════════════════════════
 # ENTRY BUILDERS
 # ═══════════════════════════════════════════════════════════════════════════
 
-def infer_id(partition: str, meta: Dict[str, Any], file_path: Path) -> str:
+def _path_stem(file_path) -> str:
+    """Path(file_path).stem without constructing a Path."""
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+def infer_id(partition: str, meta: Dict[str, Any], file_path) -> str:
     """Generate unique ID for entry."""
     # Prefer explicit ID from front-matter
     if "id" in meta:
         return str(meta["id"])
     
     # Fall back to partition.filename pattern
-    name = str(meta.get("name") or meta.get("title") or file_path.stem)
-    name_slug = re.sub(r'[^a-z0-9]+', "_", name.lower()).strip("_")
+    name = str(meta.get("name") or meta.get("title") or _path_stem(file_path))
+    name_slug = _SLUG_RE.sub("_", name.lower()).strip("_")
     return f"{partition}.{name_slug}"
 
 def infer_kind(partition: str, meta: Dict[str, Any]) -> str:
@@ -94,82 +305,405 @@ def infer_kind(partition: str, meta: Dict[str, Any]) -> str:
         return str(meta["kind"])
     
     # Partition-specific defaults
-    kind_map = {
-        "foundations": "foundation",
-        "syntax_variants": "syntax_variant",
-        "parameters": "parameter",
-        "operators": "operator",
-        "examples": "example",
-        "migrations": "migration",
-    }
-    return kind_map.get(partition, "artifact")
+    return _KIND_MAP.get(partition, "artifact")
 
-def build_entry(partition: str, lexicon_root: Path, file_path: Path) -> Dict[str, Any]:
-    """Build a single partition entry from a markdown file."""
-    meta = load_front_matter(file_path)
+def make_entry_builder(partition: str, lexicon_root: Path, hash_algo: str = "sha256") -> Callable[..., Dict[str, Any]]:
+    """
+    Specialize build_entry for one partition.
     
-    # Core fields
-    kind = infer_kind(partition, meta)
-    id_ = infer_id(partition, meta, file_path)
-    title = str(meta.get("title") or meta.get("name") or stem_to_title(file_path.stem))
+    The returned build(file_path, prev_manifest=None, manifest=None, st=None)
+    closes over the partition's hasher and the lexicon root prefix, so
+    per-file work is plain string handling (no Path.relative_to, whose
+    ValueError fallback is exception control flow). file_path may be a str.
+    """
+    root_prefix = os.path.join(str(lexicon_root), "")
+    to_posix = (lambda p: p) if os.sep == "/" else (lambda p: p.replace(os.sep, "/"))
+    new_hasher = new_hasher_factory(hash_algo)
     
-    # Version & schema
-    version = str(meta.get("schema_version") or meta.get("version") or "1.0")
+    def build(file_path, prev_manifest: Dict[str, List] = None, manifest: Dict[str, List] = None,
+              st: os.stat_result = None) -> Dict[str, Any]:
+        path_str = os.fspath(file_path)
+        
+        digest = None
+        if manifest is not None:
+            st = st or os.stat(path_str)
+            digest = manifest_digest(path_str, st, prev_manifest or {}, hash_algo)
+        
+        front_matter, computed = read_and_hash(path_str, hash_content=digest is None, new_hasher=new_hasher)
+        digest = digest or computed
+        if manifest is not None:
+            manifest[path_str] = [st.st_size, st.st_mtime_ns, digest, hash_algo]
+        
+        meta = parse_front_matter(front_matter, path_str)
+        
+        # Core fields (low-cardinality strings are interned so the many
+        # entries sharing a kind/version/status share one string object)
+        kind = sys.intern(infer_kind(partition, meta))
+        id_ = infer_id(partition, meta, path_str)
+        title = str(meta.get("title") or meta.get("name") or stem_to_title(_path_stem(path_str)))
+        
+        # Version & schema
+        version = sys.intern(str(meta.get("schema_version") or meta.get("version") or "1.0"))
+        
+        # Status (if present)
+        status = meta.get("status", "active")
+        if isinstance(status, str):
+            status = sys.intern(status)
+        
+        # Safety tier (if present)
+        safety_tier = meta.get("safety_tier")
+        safety = {"tier": safety_tier} if safety_tier is not None else {}
+        
+        # Relative path from lexicon root
+        rel_path = path_str[len(root_prefix):] if path_str.startswith(root_prefix) else path_str
+        
+        entry = {
+            "id": id_,
+            "title": title,
+            "kind": kind,
+            "version": version,
+            "status": status,
+            "provenance": {
+                "path": to_posix(rel_path),
+                "absolute_path": to_posix(path_str),
+            },
+            "hash": digest,
+        }
+        
+        # Only add safety if present
+        if safety:
+            entry["safety"] = safety
+        
+        return entry
     
-    # Status (if present)
-    status = meta.get("status", "active")
+    return build
+
+def build_entry(partition: str, lexicon_root: Path, file_path: Path,
+                prev_manifest: Dict[str, List] = None, manifest: Dict[str, List] = None,
+                st: os.stat_result = None, hash_algo: str = "sha256") -> Dict[str, Any]:
+    """
+    Build a single partition entry from a markdown file.
     
-    # Safety tier (if present)
-    safety_tier = meta.get("safety_tier")
-    safety = {"tier": safety_tier} if safety_tier is not None else {}
+    The file is read once for both front-matter and hash. When manifest
+    dicts are given, the hash is reused from prev_manifest for unchanged
+    files and recorded into manifest; st (from iter_md) saves a stat call.
+    Loops should reuse make_entry_builder(partition, lexicon_root) instead.
+    """
+    return make_entry_builder(partition, lexicon_root, hash_algo)(file_path, prev_manifest, manifest, st)
+
+# ═══════════════════════════════════════════════════════════════════════════
+# LOCK EMITTER - Block-style YAML for the fixed lock schema
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Set OMNI_PARTITIONS_LOCK_DUMPER=pyyaml to emit via yaml.dump (validation)
+LOCK_DUMPER = os.getenv("OMNI_PARTITIONS_LOCK_DUMPER", "native")
+
+_LINE_BREAK_ESCAPES = str.maketrans({"\x85": "\\N", "\u2028": "\\L", "\u2029": "\\P"})
+
+# Characters json.dumps(ensure_ascii=False) leaves raw but YAML readers
+# reject as non-printable (DEL, C1 controls, surrogates, U+FFFE/U+FFFF)
+_NON_PRINTABLE_RE = re.compile("[\x7f-\x84\x86-\x9f\ud800-\udfff\ufffe\uffff]")
+
+def _escape_non_printable(m: re.Match) -> str:
+    code = ord(m.group())
+    return f"\\x{code:02x}" if code < 0x100 else f"\\u{code:04x}"
+
+def _yaml_scalar(value: Any) -> str:
+    """Render a scalar (or empty collection) as a YAML flow token."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if value != value:
+            return ".nan"
+        if value in (float("inf"), float("-inf")):
+            return ".inf" if value > 0 else "-.inf"
+        text = repr(value)
+        # YAML 1.1 floats need a dot (1e+20 would load back as a string)
+        if "." not in text and "e" in text:
+            text = text.replace("e", ".0e", 1)
+        return text
+    if isinstance(value, dict):
+        return "{}"
+    if isinstance(value, list):
+        return "[]"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
     
-    # Relative path from lexicon root
-    try:
-        rel_path = file_path.relative_to(lexicon_root)
-    except ValueError:
-        rel_path = file_path
-    
-    entry = {
-        "id": id_,
-        "title": title,
-        "kind": kind,
-        "version": version,
-        "status": status,
-        "provenance": {
-            "path": str(rel_path.as_posix()),
-            "absolute_path": str(file_path.as_posix()),
-        },
-        "hash": sha256_file(file_path),
-    }
+    text = str(value)
+    if (_PLAIN_SCALAR_RE.match(text) and not text.endswith(" ")
+            and text.lower() not in _RESERVED_SCALARS):
+        return text
+    # JSON string syntax is valid YAML double-quoted style
+    text = json.dumps(text, ensure_ascii=False).translate(_LINE_BREAK_ESCAPES)
+    return _NON_PRINTABLE_RE.sub(_escape_non_printable, text)
+
+def _emit_mapping(write, mapping: Dict[str, Any], indent: int, first_prefix: str = None):
+    """Write a block mapping; first_prefix replaces the indent of the first key ("- " items)."""
+    pad = " " * indent
+    for i, (key, value) in enumerate(mapping.items()):
+        lead = first_prefix if i == 0 and first_prefix is not None else pad
+        key = _yaml_scalar(key)
+        if isinstance(value, dict) and value:
+            write(f"{lead}{key}:\n")
+            _emit_mapping(write, value, indent + 2)
+        elif isinstance(value, list) and value:
+            write(f"{lead}{key}:\n")
+            _emit_sequence(write, value, indent)
+        else:
+            write(f"{lead}{key}: {_yaml_scalar(value)}\n")
+
+def _emit_sequence(write, sequence: List[Any], indent: int):
+    """Write a block sequence at the parent key's indent (PyYAML layout)."""
+    pad = " " * indent
+    for item in sequence:
+        if isinstance(item, dict) and item:
+            _emit_mapping(write, item, indent + 2, first_prefix=f"{pad}- ")
+        elif isinstance(item, list) and item:
+            write(f"{pad}-\n")
+            _emit_sequence(write, item, indent + 2)
+        else:
+            write(f"{pad}- {_yaml_scalar(item)}\n")
+
+def _pyyaml_block(obj: Any, indent: int = 0) -> str:
+    """yaml.dump obj in block style, shifted right by indent spaces."""
+    yaml = _load_yaml()
+    text = yaml.dump(obj, Dumper=_SafeDumper, sort_keys=False, allow_unicode=True, default_flow_style=False)
+    if not indent:
+        return text
+    pad = " " * indent
+    return "".join(pad + line for line in text.splitlines(True))
+
+class _LockStream:
+    """
+    Writes the lock to disk as entries arrive instead of holding it in memory.
+    
+    Entries must arrive grouped by partition in _KIND_MAP order (the order
+    PARTITION_MAP is scanned in); partitions with no entries are emitted
+    empty. Output goes to a temp file that replaces path on close().
+    """
+    mode = "w"
+    encoding = "utf-8"
+    
+    def __init__(self, path: Path, header: Dict[str, Any]):
+        self.path = path
+        self._tmp_path = path.with_name(path.name + ".tmp")
+        self._f = open(self._tmp_path, self.mode, encoding=self.encoding)
+        self._pending = list(_KIND_MAP)
+        self._current = None
+        try:
+            self.begin(header)
+        except BaseException:
+            self.abort()
+            raise
+    
+    def add(self, partition: str, entry: Dict[str, Any]):
+        if partition != self._current:
+            self._advance_to(partition)
+        self.write_entry(entry)
+    
+    def _advance_to(self, partition: str):
+        if self._current is not None:
+            self.end_partition()
+        while self._pending:
+            name = self._pending.pop(0)
+            if name == partition:
+                self._current = name
+                self.begin_partition(name)
+                return
+            self.empty_partition(name)
+        raise ValueError(f"Partition out of order: {partition}")
+    
+    def close(self):
+        if self._current is not None:
+            self.end_partition()
+        for name in self._pending:
+            self.empty_partition(name)
+        self.end()
+        self._f.close()
+        os.replace(self._tmp_path, self.path)
+    
+    def abort(self):
+        self._f.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+class _YamlLockStream(_LockStream):
+    """Block YAML via the native emitter (or yaml.dump with OMNI_PARTITIONS_LOCK_DUMPER=pyyaml)."""
+    
+    def begin(self, header):
+        if LOCK_DUMPER == "pyyaml":
+            self._f.write(_pyyaml_block(header))
+        else:
+            _emit_mapping(self._f.write, header, 0)
+        self._f.write("partitions:\n")
     
-    # Only add safety if present
-    if safety:
-        entry["safety"] = safety
+    def begin_partition(self, name):
+        self._f.write(f"  {name}:\n")
     
-    return entry
+    def write_entry(self, entry):
+        if LOCK_DUMPER == "pyyaml":
+            self._f.write(_pyyaml_block([entry], 2))
+        else:
+            _emit_mapping(self._f.write, entry, 4, first_prefix="  - ")
+    
+    def end_partition(self):
+        pass
+    
+    def empty_partition(self, name):
+        self._f.write(f"  {name}: []\n")
+    
+    def end(self):
+        pass
+
+class _JsonLockStream(_LockStream):
+    """Compact JSON, one serializer call per entry."""
+    mode = "wb"
+    encoding = None
+    
+    def begin(self, header):
+        fields = [_dumps_json(k) + b":" + _dumps_json(v) for k, v in header.items()]
+        self._f.write(b"{" + b",".join(fields) + b',"partitions":{')
+        self._partition_sep = b""
+    
+    def begin_partition(self, name):
+        self._f.write(self._partition_sep + _dumps_json(name) + b":[")
+        self._partition_sep = b","
+        self._entry_sep = b""
+    
+    def write_entry(self, entry):
+        self._f.write(self._entry_sep + _dumps_json(entry))
+        self._entry_sep = b","
+    
+    def end_partition(self):
+        self._f.write(b"]")
+    
+    def empty_partition(self, name):
+        self._f.write(self._partition_sep + _dumps_json(name) + b":[]")
+        self._partition_sep = b","
+    
+    def end(self):
+        self._f.write(b"}}")
 
 # ═══════════════════════════════════════════════════════════════════════════
 # MAIN BUILDER
 # ═══════════════════════════════════════════════════════════════════════════
 
-def build_partitions_lock(lexicon_root: Path, output_path: Path):
-    """Build canon.partitions.lock.yaml from lexicon structure."""
+# Above this many files, partitions are built in separate processes
+PROCESS_POOL_MIN_FILES = 500
+
+# Per-entry progress lines are written to stdout in batches of this size
+PROGRESS_BATCH_SIZE = 100
+
+# Futures in flight per pool worker; finished entries are dropped once
+# yielded, so memory stays bounded however many files there are
+INFLIGHT_PER_WORKER = 4
+
+# Files per process-pool task (one partition each)
+PROCESS_BATCH_SIZE = 64
+
+def _build_partition_entries(partition: str, lexicon_root: Path, files: List[Tuple[str, os.stat_result]],
+                             prev_manifest: Dict[str, List], hash_algo: str) -> Tuple[List[Tuple], Dict[str, List]]:
+    """
+    Process-pool worker: build the entries of one batch of a partition's files.
+    
+    Returns ([(md_path, entry, error), ...], manifest_updates) since the
+    parent's manifest dict cannot be shared across processes.
+    """
+    build = make_entry_builder(partition, lexicon_root, hash_algo)
+    manifest = {}
+    results = []
+    for md_path, st in files:
+        try:
+            entry = build(md_path, prev_manifest, manifest, st)
+            results.append((md_path, entry, None))
+        except Exception as e:
+            results.append((md_path, None, str(e)))  # Not every exception pickles
+    return results, manifest
+
+def _iter_windowed(tasks: Iterator[Tuple[Any, Callable[[], Future]]], window: int) -> Iterator[Tuple[Any, Future]]:
+    """
+    Submit tasks ((tag, submit) pairs) lazily, keeping at most window futures
+    in flight, and yield (tag, future) in submission order.
+    """
+    pending = deque()
+    for tag, submit in tasks:
+        if len(pending) >= window:
+            yield pending.popleft()
+        pending.append((tag, submit()))
+    while pending:
+        yield pending.popleft()
+
+def _iter_entries_threaded(lexicon_root: Path, files: List[Tuple], prev_manifest: Dict[str, List],
+                           manifest: Dict[str, List], hash_algo: str) -> Iterator[Tuple]:
+    """Yield (partition, md_path, entry, error) in file order, building on a thread pool."""
+    # hashlib releases the GIL, so threads overlap hashing and I/O
+    builders = {name: make_entry_builder(name, lexicon_root, hash_algo) for name in set(PARTITION_MAP.values())}
+    workers = (os.cpu_count() or 1) * 2
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        tasks = (((partition_name, md_path),
+                  partial(ex.submit, builders[partition_name], md_path, prev_manifest, manifest, st))
+                 for partition_name, md_path, st in files)
+        for (partition_name, md_path), future in _iter_windowed(tasks, workers * INFLIGHT_PER_WORKER):
+            try:
+                yield partition_name, md_path, future.result(), None
+            except Exception as e:
+                yield partition_name, md_path, None, e
+
+def _iter_entries_by_partition(lexicon_root: Path, files: List[Tuple], prev_manifest: Dict[str, List],
+                               manifest: Dict[str, List], hash_algo: str) -> Iterator[Tuple]:
+    """Yield (partition, md_path, entry, error) in file order, in per-partition batches on a process pool."""
+    # YAML parsing and entry building are GIL-bound; batches are independent
+    def batches():
+        batch, batch_partition = [], None
+        for partition_name, md_path, st in files:
+            if batch and (partition_name != batch_partition or len(batch) >= PROCESS_BATCH_SIZE):
+                yield batch_partition, batch
+                batch = []
+            batch_partition = partition_name
+            batch.append((md_path, st))
+        if batch:
+            yield batch_partition, batch
+    
+    workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        tasks = ((partition_name, partial(
+                     ex.submit, _build_partition_entries, partition_name, lexicon_root, batch,
+                     {md_path: prev_manifest[md_path] for md_path, _ in batch if md_path in prev_manifest},
+                     hash_algo))
+                 for partition_name, batch in batches())
+        for partition_name, future in _iter_windowed(tasks, workers * INFLIGHT_PER_WORKER):
+            results, manifest_updates = future.result()
+            manifest.update(manifest_updates)
+            for md_path, entry, error in results:
+                yield partition_name, md_path, entry, error
+
+def build_partitions_lock(lexicon_root: Path, output_path: Path, fmt: str = "yaml", hash_algo: str = None,
+                          quiet: bool = False):
+    """
+    Build canon.partitions.lock.yaml from lexicon structure.
+    
+    fmt selects the output: "yaml" (output_path), "json" (output_path with a
+    .json suffix, for machine consumers) or "both". hash_algo (default
+    HASH_ALGO) names the entry content hash, recorded in the lock header.
+    quiet drops the per-entry progress lines; errors and the summary remain.
+    """
+    hash_algo = hash_algo or HASH_ALGO
+    new_hasher_factory(hash_algo)  # Fail fast on unknown/uninstalled algorithms
     
     if not lexicon_root.exists():
         print(f"ERROR: Lexicon root not found: {lexicon_root}")
         sys.exit(1)
     
-    # Initialize partitions
-    partitions = {
-        "foundations": [],
-        "syntax_variants": [],
-        "parameters": [],
-        "operators": [],
-        "examples": [],
-        "migrations": [],
-    }
+    # Hash manifest from the previous build lets unchanged files skip hashing
+    manifest_path = hash_manifest_path(output_path)
+    prev_manifest = load_hash_manifest(manifest_path)
+    manifest = {}
     
-    # Scan each partition folder
+    # Collect files from each partition folder
+    files = []
     for folder_name, partition_name in PARTITION_MAP.items():
         folder_path = lexicon_root / folder_name
         
@@ -180,41 +714,96 @@ def build_partitions_lock(lexicon_root: Path, output_path: Path):
         print(f"Scanning {folder_name}...")
         
         # Find all markdown files (excluding README.md)
-        for md_file in folder_path.rglob("*.md"):
-            if md_file.name.upper() == "README.MD":
-                continue  # Skip navigation files
-            
-            try:
-                entry = build_entry(partition_name, lexicon_root, md_file)
-                partitions[partition_name].append(entry)
-                print(f"  ✓ {entry['id']}")
-            except Exception as e:
-                print(f"  ✗ ERROR processing {md_file}: {e}")
+        for md_path, st in iter_md(folder_path):
+            files.append((partition_name, md_path, st))
     
-    # Build lock document
-    lock = {
+    # Lock header; partitions are streamed after it
+    header = {
         "schema": "2.0",
         "generated_at": datetime.now(timezone.utc).isoformat(),
+        "hash_algo": hash_algo,
         "description": "Partition lock for non-school lexicon content (foundations, syntax, operators, parameters, examples, migrations)",
         "architecture": {
             "canon.lock.yaml": "Pure Arcane Schools (20 schools, Rosetta Archaeologist)",
             "canon.partitions.lock.yaml": "Everything else (this file)",
         },
-        "partitions": partitions,
     }
     
-    # Write to file
-    with open(output_path, "w", encoding="utf-8") as f:
-        yaml.dump(lock, f, sort_keys=False, allow_unicode=True, default_flow_style=False)
+    streams = []
+    counts = {name: 0 for name in _KIND_MAP}
+    
+    # Hash + parse front-matter concurrently; results arrive grouped by partition
+    if len(files) >= PROCESS_POOL_MIN_FILES:
+        results = _iter_entries_by_partition(lexicon_root, files, prev_manifest, manifest, hash_algo)
+    else:
+        results = _iter_entries_threaded(lexicon_root, files, prev_manifest, manifest, hash_algo)
+    
+    # Entries within a partition are emitted sorted by id (ties keep file
+    # order), so the lock does not depend on filesystem traversal order.
+    # Memory holds the current partition's entries (the heap) plus the
+    # bounded window of in-flight futures; earlier partitions are on disk.
+    heap = []
+    current = None
+    progress = []
+    
+    def log(line: str):
+        progress.append(line)
+        if len(progress) >= PROGRESS_BATCH_SIZE:
+            flush_progress()
+    
+    def flush_progress():
+        if progress:
+            sys.stdout.write("\n".join(progress) + "\n")
+            progress.clear()
+    
+    def flush_partition():
+        while heap:
+            entry = heapq.heappop(heap)[2]
+            for stream in streams:
+                stream.add(current, entry)
+    
+    try:
+        # Opened inside the try so a failure opening one stream aborts the other
+        if fmt in ("yaml", "both"):
+            streams.append(_YamlLockStream(output_path, header))
+        if fmt in ("json", "both"):
+            # JSON is also valid YAML 1.2, so YAML readers can consume it too
+            streams.append(_JsonLockStream(output_path.with_suffix(".json"), header))
+        
+        for seq, (partition_name, md_file, entry, error) in enumerate(results):
+            if error is not None:
+                log(f"  ✗ ERROR processing {md_file}: {error}")
+                continue
+            if partition_name != current:
+                flush_partition()
+                current = partition_name
+            heapq.heappush(heap, (entry["id"], seq, entry))
+            counts[partition_name] += 1
+            if not quiet:
+                log(f"  ✓ {entry['id']}")
+        flush_partition()
+    except BaseException:
+        for stream in streams:
+            stream.abort()
+        raise
+    finally:
+        flush_progress()
+    for stream in streams:
+        stream.close()
+    outputs = [stream.path for stream in streams]
+    try:
+        save_hash_manifest(manifest_path, manifest)
+    except OSError as e:
+        print(f"WARNING: Could not write hash manifest {manifest_path}: {e}")
     
     # Summary
-    counts = {name: len(entries) for name, entries in partitions.items()}
     total = sum(counts.values())
     
     print("\n" + "="*80)
     print("✅ PARTITION LOCK GENERATED")
     print("="*80)
-    print(f"Output: {output_path}")
+    for path in outputs:
+        print(f"Output: {path}")
     print(f"\nPartition Counts:")
     for name, count in counts.items():
         print(f"  - {name:20s}: {count:3d} entries")
@@ -226,6 +815,21 @@ def build_partitions_lock(lexicon_root: Path, output_path: Path):
 # ═══════════════════════════════════════════════════════════════════════════
 
 def main():
+    ap = argparse.ArgumentParser(description="Build canon.partitions.lock.yaml")
+    ap.add_argument("--format", dest="fmt", choices=["yaml", "json", "both"], default="yaml",
+                    help="Lock output format (json is written next to the .yaml path)")
+    ap.add_argument("--hash-algo", choices=HASH_ALGOS, default=HASH_ALGO,
+                    help="Entry content hash (blake3/xxh3_128 need their wheels installed)")
+    ap.add_argument("-q", "--quiet", action="store_true",
+                    help="Only print errors and the summary, not every entry")
+    args = ap.parse_args()
+    
+    try:
+        _load_yaml()
+    except ImportError:
+        print("ERROR: PyYAML is required. Install with: pip install pyyaml")
+        sys.exit(2)
+    
     # Determine paths relative to script location
     script_dir = Path(__file__).parent
     lexicon_root = (script_dir / "../lexicon").resolve()
@@ -237,7 +841,7 @@ def main():
     print(f"Output File:  {output_path}")
     print("="*80 + "\n")
     
-    build_partitions_lock(lexicon_root, output_path)
+    build_partitions_lock(lexicon_root, output_path, fmt=args.fmt, hash_algo=args.hash_algo, quiet=args.quiet)
 
 if __name__ == "__main__":
     try:
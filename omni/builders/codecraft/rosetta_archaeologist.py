@@ -26,19 +26,54 @@ Usage:
 from __future__ import annotations
 import argparse
 import hashlib
+import io
+import json
+import mmap
 import os
+import pickle
 import re
 import sys
 import time
 import subprocess
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
 from typing import Dict, Any, List, Tuple, Optional
 
+# PyYAML is imported lazily (~30ms): --help, hash, and verify/scan served from
+# the per-user canon pickle cache never touch it.
+#
+# libyaml-backed loader when PyYAML was built with it. Dumping stays on the
+# pure-Python SafeDumper: libyaml escapes astral-plane characters, so every
+# school emoji would come out as "\U0001F52E" in canon.lock.yaml.
+_yaml = None
+_Loader = _Dumper = None
+
+def _import_yaml():
+    """Import PyYAML on first use (exits with a hint if it is not installed)."""
+    global _yaml, _Loader, _Dumper
+    if _yaml is None:
+        try:
+            import yaml
+        except ImportError:
+            print("ERROR: PyYAML required: pip install pyyaml", file=sys.stderr)
+            sys.exit(2)
+        try:
+            from yaml import CSafeLoader as loader
+        except ImportError:
+            from yaml import SafeLoader as loader
+        _Loader, _Dumper = loader, yaml.SafeDumper
+        _yaml = yaml
+    return _yaml
+
+# Optional: orjson for reading/writing JSON canon locks (falls back to stdlib json)
 try:
-    import yaml
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    print("ERROR: PyYAML required: pip install pyyaml", file=sys.stderr)
-    sys.exit(2)
+    ORJSON_AVAILABLE = False
 
 # ---------- Tiny Markdown Helpers (Stable & Deterministic) ----------
 H1 = re.compile(r'^\s*#\s+(?P<text>.+?)\s*$')
@@ -46,6 +81,7 @@ H2 = re.compile(r'^\s*##\s+(?P<text>.+?)\s*$')
 FENCE = re.compile(r'^\s*```(?P<lang>[a-zA-Z0-9_-]*)\s*$')
 LIST = re.compile(r'^\s*[-*]\s+(?P<text>.+?)\s*$')
 FRONT_MATTER = re.compile(r'^\s*---\s*\n(?P<y>.*?\n)---\s*\n', re.DOTALL)
+CANONICAL_ID = re.compile(r'^[a-z0-9_]+$')  # snake_case school ids (verify)
 
 # ---------- Commentomancy Extractors (Lore Channel) ----------
 COMMENTOMANCY_PATTERNS = {
@@ -56,6 +92,20 @@ COMMENTOMANCY_PATTERNS = {
     "sacred_truth": re.compile(r'📜\s*///(.+?)$', re.MULTILINE),
     "guardrail": re.compile(r'🛡️\s*//\!\?(.+?)$', re.MULTILINE),
 }
+# Pattern key → lore bucket
+COMMENTOMANCY_LORE_KEYS = {
+    "strategic_decision": "strategic_decisions",
+    "emergent_pattern": "emergent_patterns",
+    "heart_imprint": "heart_imprints",
+    "evolution_pressure": "evolution_pressure",
+    "sacred_truth": "sacred_truths",
+    "guardrail": "guardrails",
+}
+# All six as one zero-width alternation (named group per sigil, body in the next group)
+COMMENTOMANCY_COMBINED = re.compile(
+    "(?=" + "|".join(f"(?P<{k}>{p.pattern})" for k, p in COMMENTOMANCY_PATTERNS.items()) + ")",
+    re.MULTILINE,
+)
 
 # Section normalization (map messy human headings → canonical keys)
 SECTION_ALIASES = {
@@ -65,28 +115,120 @@ SECTION_ALIASES = {
     "examples": ["examples", "samples", "spells", "real ritual examples", "common patterns", "advanced patterns"],
 }
 
-def norm_h2(title: str) -> Optional[str]:
-    """Normalize H2 heading to canonical section key."""
-    t = title.strip().lower()
+def _match_alias(t: str) -> Optional[str]:
+    """First canonical key with an alias contained in the (lowercased) heading."""
     for key, aliases in SECTION_ALIASES.items():
         if any(a in t for a in aliases):
             return key
     return None
 
+# Exact heading → key, resolved through _match_alias so overlaps
+# ("when to use") keep the same first-key-wins answer
+_EXACT_ALIAS = {a: _match_alias(a) for aliases in SECTION_ALIASES.values() for a in aliases}
+
+@lru_cache(maxsize=512)
+def norm_h2(title: str) -> Optional[str]:
+    """Normalize H2 heading to canonical section key."""
+    t = title.strip().lower()
+    return _EXACT_ALIAS.get(t) or _match_alias(t)
+
+def _h2_text(ls: str) -> Optional[str]:
+    """
+    Heading text if the (left-stripped) line is an H2, else None.
+    '## Title' is sliced directly; other shapes go through the H2 regex.
+    """
+    if ls.startswith('## '):
+        text = ls[3:].strip()
+        if text:
+            return text
+    m = H2.match(ls)
+    return m.group('text') if m else None
+
+def _list_text(ls: str) -> Optional[str]:
+    """
+    Bullet text if the (left-stripped) line is a list item, else None.
+    '- item' / '* item' are sliced directly; other shapes go through LIST.
+    """
+    if ls[:2] in ('- ', '* '):
+        text = ls[2:].strip()
+        if text:
+            return text
+    m = LIST.match(ls)
+    return m.group('text').strip() if m else None
+
+def parse_markdown(md: str, langs=("codecraft", "ccraft")) -> Tuple[Dict[str, List[str]], List[str], Dict[str, List[str]]]:
+    """
+    Single pass over a markdown body.
+    Returns: (sections {canonical_key: [lines]}, fences [code of `langs` blocks],
+              lists {canonical_key: [bullet texts]})
+    Fences are read across sections in section-key order, same as
+    extract_fences over the concatenated section lines.
+    """
+    sections: Dict[str, List[str]] = {}
+    lists: Dict[str, List[str]] = {}
+    fence_marks: Dict[str, List[Tuple[int, str]]] = {}
+    cur = None
+    lines = items = marks = None
+    for ln in md.splitlines():
+        ls = ln.lstrip()
+        if ls.startswith('##'):
+            title = _h2_text(ls)
+            if title is not None:
+                cur = norm_h2(title) or title.strip()
+                lines = sections.setdefault(cur, [])
+                items = lists.setdefault(cur, [])
+                marks = fence_marks.setdefault(cur, [])
+                continue
+        if cur is None:
+            continue
+        if ls.startswith('```'):
+            m = FENCE.match(ls)
+            if m:
+                marks.append((len(lines), (m.group('lang') or "").lower()))
+        elif ls[:1] in ('-', '*'):
+            text = _list_text(ls)
+            if text is not None:
+                items.append(text)
+        lines.append(ln)
+    
+    # Fence state carries across section boundaries (key order)
+    fences: List[str] = []
+    inb = False
+    lang = ""
+    buf: List[str] = []
+    for key, sec_lines in sections.items():
+        pos = 0
+        for idx, mark_lang in fence_marks[key]:
+            if not inb:
+                inb = True
+                lang = mark_lang
+                buf = []
+            else:
+                buf.extend(sec_lines[pos:idx])
+                if lang in langs:
+                    fences.append("\n".join(buf).strip())
+                inb = False
+                lang = ""
+                buf = []
+            pos = idx + 1
+        if inb:
+            buf.extend(sec_lines[pos:])
+    return sections, fences, lists
+
 def parse_sections(md: str) -> Dict[str, List[str]]:
     """Extract H2 sections → {canonical_key: [lines]}."""
-    lines = md.splitlines()
-    cur = None
-    out: Dict[str, List[str]] = {}
-    for ln in lines:
-        m = H2.match(ln)
-        if m:
-            k = norm_h2(m.group('text')) or m.group('text').strip()
-            cur = k
-            out.setdefault(cur, [])
-        elif cur is not None:
-            out[cur].append(ln)
-    return out
+    return parse_markdown(md)[0]
+
+def filter_items(items: List[str], prefix_filter: Optional[str] = None) -> List[str]:
+    """
+    Dedupe bullet texts preserving order.
+    If prefix_filter is provided, only keep items starting with that prefix (e.g., '✅', '❌').
+    """
+    if not prefix_filter:
+        return list(dict.fromkeys(items))
+    # Remove the prefix (✅ or ❌) and clean up
+    n = len(prefix_filter)
+    return list(dict.fromkeys(t[n:].strip() for t in items if t.startswith(prefix_filter)))
 
 def extract_list(lines: List[str], prefix_filter: Optional[str] = None) -> List[str]:
     """
@@ -95,17 +237,12 @@ def extract_list(lines: List[str], prefix_filter: Optional[str] = None) -> List[
     """
     got = []
     for ln in lines:
-        m = LIST.match(ln)
-        if m:
-            text = m.group('text').strip()
-            if prefix_filter:
-                if text.startswith(prefix_filter):
-                    # Remove the prefix (✅ or ❌) and clean up
-                    text = text[len(prefix_filter):].strip()
-                    got.append(text)
-            else:
+        ls = ln.lstrip()
+        if ls[:1] in ('-', '*'):
+            text = _list_text(ls)
+            if text is not None:
                 got.append(text)
-    return list(dict.fromkeys(got))
+    return filter_items(got, prefix_filter)
 
 def extract_fences(lines: List[str], langs=("codecraft", "ccraft")) -> List[str]:
     """Extract fenced code blocks of specified languages."""
@@ -130,16 +267,60 @@ def extract_fences(lines: List[str], langs=("codecraft", "ccraft")) -> List[str]
             buf.append(ln)
     return out
 
-def sha256_path(p: Path) -> str:
-    """Compute sha256 hash of file."""
+SHA256_MMAP_MIN_BYTES = 1 << 20
+
+def sha256_path(p: Path, st: Optional[os.stat_result] = None) -> str:
+    """
+    Compute sha256 hash of file.
+    Small files are hashed from one read; large ones straight from an mmap.
+    Pass `st` when the caller already has the file's stat result.
+    """
+    if st is None:
+        st = p.stat()
+    if st.st_size < SHA256_MMAP_MIN_BYTES:
+        return hashlib.sha256(p.read_bytes()).hexdigest()
     h = hashlib.sha256()
-    with p.open('rb') as f:
-        for chunk in iter(lambda: f.read(65536), b''):
-            h.update(chunk)
-    return h.hexdigest()
+    try:
+        with p.open('rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            h.update(mm)
+        return h.hexdigest()
+    except (ValueError, OSError):
+        # File shrank/emptied since stat, or the FS refuses mmap
+        h = hashlib.sha256()
+        with p.open('rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                h.update(chunk)
+        return h.hexdigest()
+
+def _read_git_head(git_dir: Path) -> Optional[str]:
+    """Resolve HEAD from a .git directory's files (loose ref, then packed-refs)."""
+    try:
+        head = (git_dir / "HEAD").read_text(encoding='utf-8').strip()
+        if not head.startswith("ref: "):
+            return head or None
+        ref = head[5:].strip()
+        ref_file = git_dir / ref
+        if ref_file.is_file():
+            return ref_file.read_text(encoding='utf-8').strip() or None
+        packed = git_dir / "packed-refs"
+        if packed.is_file():
+            for ln in packed.read_text(encoding='utf-8').splitlines():
+                if ln.endswith(" " + ref) and not ln.startswith(("#", "^")):
+                    return ln.split(" ", 1)[0]
+    except OSError:
+        pass
+    return None
 
 def git_head(root: Path) -> Optional[str]:
     """Get current git HEAD sha, None if not in git repo."""
+    # Plain checkout at root: read .git directly instead of forking git.
+    # Worktrees/submodules (.git is a file) and subdirectories of a repo
+    # fall through to rev-parse.
+    git_dir = root / ".git"
+    if git_dir.is_dir():
+        sha = _read_git_head(git_dir)
+        if sha:
+            return sha
     try:
         return subprocess.check_output(
             ["git", "-C", str(root), "rev-parse", "HEAD"],
@@ -151,23 +332,311 @@ def git_head(root: Path) -> Optional[str]:
 # ---------- Loaders ----------
 def load_yaml(path: Path) -> Any:
     """Load YAML file."""
+    yaml = _import_yaml()
     with path.open('r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_Loader)
+
+def dump_yaml(obj: Any, f) -> None:
+    """Write obj as canon-style YAML (insertion order, raw unicode) to stream f."""
+    yaml = _import_yaml()
+    yaml.dump(obj, f, Dumper=_Dumper, sort_keys=False, allow_unicode=True)
 
 def read_text(path: Path) -> str:
     """Read text file with UTF-8."""
     return path.read_text(encoding='utf-8', errors='ignore')
 
+def load_json(path: Path) -> Any:
+    """Load JSON file, via orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text(encoding='utf-8'))
+
+def dumps_json(obj: Any) -> bytes:
+    """
+    Compact UTF-8 JSON, via orjson when installed.
+    No indent: stdlib json only uses its C encoder without one (~4x faster).
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+# ---------- Parse Cache (sha256-keyed, survives across runs) ----------
+# Kept in the per-user cache, never in the CodeCraft checkout. Entries are
+# keyed by content, so every checkout on the machine shares them.
+ARCHAEOLOGIST_CACHE_DIR = Path(
+    os.getenv("OMNI_CANON_CACHE_DIR") or Path.home() / ".cache" / "omni" / "rosetta_archaeologist"
+)
+CANON_CACHE_DIR = ARCHAEOLOGIST_CACHE_DIR / "parse"
+# Bump whenever parser or canon output changes: entries written under
+# another version are ignored instead of being served stale.
+CANON_CACHE_VERSION = 2
+
+def _cache_get(cache_dir: Optional[Path], sha: str, kind: str) -> Any:
+    """Return the cached parse for (sha, kind), None on miss."""
+    if cache_dir is None:
+        return None
+    try:
+        doc = load_json(cache_dir / f"{sha}.{kind}.json")
+    except (OSError, ValueError):
+        return None
+    if not isinstance(doc, dict) or doc.get("v") != CANON_CACHE_VERSION:
+        return None
+    return doc.get("data")
+
+def _cache_put(cache_dir: Optional[Path], sha: str, kind: str, data: Any) -> None:
+    """
+    Store a parse result under (sha, kind).
+    Skipped when the value does not survive a JSON round trip unchanged
+    (dates, non-string keys) so a cache hit always equals a fresh parse.
+    """
+    if cache_dir is None:
+        return
+    try:
+        text = json.dumps({"v": CANON_CACHE_VERSION, "data": data}, ensure_ascii=False)
+        if json.loads(text)["data"] != data:
+            return
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        (cache_dir / f"{sha}.{kind}.json").write_text(text, encoding='utf-8')
+    except (OSError, TypeError, ValueError):
+        pass
+
+def load_yaml_cached(path: Path, cache_dir: Optional[Path]) -> Any:
+    """load_yaml, served from the parse cache when the file is unchanged."""
+    sha = sha256_path(path)
+    data = _cache_get(cache_dir, sha, "yaml")
+    if data is None:
+        data = load_yaml(path)
+        _cache_put(cache_dir, sha, "yaml", data)
+    return data
+
+# ---------- Canon Lock Loading (per-user pickle cache, keyed on stat) ----------
+# Per-lock caches (pickle, school index) live in the user's own cache dir:
+# a pickle sitting next to the lock in a checkout could run arbitrary code
+# on load, and both are only valid for the local file's stat anyway.
+CANON_PICKLE_DIR = ARCHAEOLOGIST_CACHE_DIR / "canon"
+CANON_PICKLE_SUFFIX = '.pkl'
+
+def _canon_cache_path(path: Path, suffix: str) -> Path:
+    """Cache file for a canon lock, named after a hash of its absolute path."""
+    digest = hashlib.sha1(str(path.resolve()).encode('utf-8')).hexdigest()[:12]
+    return CANON_PICKLE_DIR / f"{path.name}.{digest}{suffix}"
+
+def _intern_strings(obj: Any) -> Any:
+    """
+    sys.intern every str key/value in a parsed document, in place.
+    Repeated names collapse to one object, which the pickle memo then
+    stores once. Shared or recursive containers are visited once.
+    """
+    intern = sys.intern
+    seen = set()
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        if isinstance(o, dict):
+            items = list(o.items())
+            o.clear()
+            for k, v in items:
+                if type(k) is str:
+                    k = intern(k)
+                if type(v) is str:
+                    v = intern(v)
+                elif isinstance(v, (dict, list)):
+                    stack.append(v)
+                o[k] = v
+        elif isinstance(o, list):
+            for i, v in enumerate(o):
+                if type(v) is str:
+                    o[i] = intern(v)
+                elif isinstance(v, (dict, list)):
+                    stack.append(v)
+    return obj
+
+def _load_canon(path: Path) -> Any:
+    """
+    Parse a canon lock (YAML, or JSON by suffix) for verify/scan.
+    The result is pickled under CANON_PICKLE_DIR and reused while the lock's
+    (mtime_ns, size) is unchanged, so warm runs skip parsing entirely.
+    """
+    st = path.stat()
+    key = (CANON_CACHE_VERSION, st.st_mtime_ns, st.st_size)
+    pkl = _canon_cache_path(path, CANON_PICKLE_SUFFIX)
+    try:
+        with pkl.open('rb') as f:
+            stored, canon = pickle.load(f)
+        if stored == key:
+            return canon
+    except Exception:
+        pass  # missing, stale format or truncated pickle: reparse
+    
+    canon = _intern_strings(load_json(path) if path.suffix.lower() == '.json' else load_yaml(path))
+    tmp = pkl.with_name(f"{pkl.name}.{os.getpid()}.tmp")
+    try:
+        pkl.parent.mkdir(parents=True, exist_ok=True)
+        with tmp.open('wb') as f:
+            pickle.dump((key, canon), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, pkl)
+    except (OSError, pickle.PicklingError):
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+    return canon
+
+# ---------- School Index (byte spans into canon.lock.yaml for scan) ----------
+CANON_INDEX_SUFFIX = '.idx.json'
+_TOP_LEVEL_LINE = re.compile(rb'^\S', re.M)
+_SCHOOL_KEY_LINE = re.compile(rb'^  \S[^\n]*$', re.M)
+
+def _index_path(canon_path: Path) -> Path:
+    return _canon_cache_path(canon_path, CANON_INDEX_SUFFIX)
+
+def school_spans(data: bytes, keys: List[Any]) -> Optional[List[Tuple[int, int]]]:
+    """
+    Byte (start, end) of each entry under the top-level `schools:` mapping
+    of dumped canon YAML, in order. None unless the lines found there are
+    exactly `keys` (so an unexpected layout never yields a bad index).
+    """
+    m = re.search(rb'^schools:\n', data, re.M)
+    if not m:
+        return None
+    top = _TOP_LEVEL_LINE.search(data, m.end())
+    stop = top.start() if top else len(data)
+    starts = [k.start() for k in _SCHOOL_KEY_LINE.finditer(data, m.end(), stop)]
+    if len(starts) != len(keys):
+        return None
+    yaml = _import_yaml()
+    for start, key in zip(starts, keys):
+        line = data[start:data.index(b'\n', start)]
+        try:
+            if list(yaml.load(line, Loader=_Loader)) != [key]:
+                return None
+        except (yaml.YAMLError, TypeError):
+            return None
+    return list(zip(starts, starts[1:] + [stop]))
+
+def _school_number(school: Dict[str, Any]) -> Any:
+    """Number a scan query can name a school by: school_number, else its integer id (what extract writes)."""
+    number = school.get("school_number")
+    if number is None and isinstance(school.get("id"), int):
+        number = school["id"]
+    return number
+
+def write_school_index(canon_path: Path, data: bytes, schools: Dict[str, Any]) -> None:
+    """
+    Write the school index (CANON_PICKLE_DIR, see _index_path): per-school
+    lookup fields plus its byte span in the canon. Best effort: scan falls
+    back to the full canon without it.
+    """
+    idx_path = _index_path(canon_path)
+    spans = school_spans(data, list(schools))
+    if spans is None:
+        try:
+            idx_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return
+    st = canon_path.stat()
+    entries = [
+        {
+            "key": key,
+            "school_number": _school_number(school),
+            "id": str(school.get("id", "")),
+            "name": str(school.get("name", "")),
+            "start": start,
+            "end": end,
+        }
+        for (key, school), (start, end) in zip(schools.items(), spans)
+    ]
+    # Numeric queries resolve straight to a position (first school wins, as in _match_school)
+    by_number: Dict[str, int] = {}
+    for i, e in enumerate(entries):
+        n = e["school_number"]
+        if isinstance(n, (int, float)) and n == int(n):
+            by_number.setdefault(str(int(n)), i)
+    doc = {"v": CANON_CACHE_VERSION, "mtime_ns": st.st_mtime_ns, "size": st.st_size,
+           "by_number": by_number, "schools": entries}
+    tmp = idx_path.with_name(f"{idx_path.name}.{os.getpid()}.tmp")
+    try:
+        idx_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_bytes(dumps_json(doc))
+        os.replace(tmp, idx_path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+def _match_school(query: str, entries: List[Tuple[Any, Any, str, str]]) -> Optional[int]:
+    """
+    Position of the school a scan query names, among (key, school_number, id, name)
+    entries: exact school_number first, then id/name substring or exact key.
+    """
+    if query.isdigit():
+        school_num = int(query)
+        for i, (_, number, _, _) in enumerate(entries):
+            if number == school_num:
+                return i
+    for i, (key, _, school_id, school_name) in enumerate(entries):
+        if query in school_id.lower() or query in school_name.lower() or query == key.lower():
+            return i
+    return None
+
+def _indexed_school(canon_path: Path, query: str) -> Optional[Tuple[Any, Dict[str, Any]]]:
+    """(key, school) via the school index, parsing only that school's span; None to fall back."""
+    try:
+        idx = load_json(_index_path(canon_path))
+        st = canon_path.stat()
+        if (idx.get("v"), idx.get("mtime_ns"), idx.get("size")) != (CANON_CACHE_VERSION, st.st_mtime_ns, st.st_size):
+            return None
+        entries = idx["schools"]
+        i = idx["by_number"].get(str(int(query))) if query.isdigit() else None
+        if i is None:
+            i = _match_school(query, [(e["key"], e["school_number"], e["id"], e["name"]) for e in entries])
+        if i is None:
+            return None
+        e = entries[i]
+        with canon_path.open('rb') as f:
+            f.seek(e["start"])
+            chunk = f.read(e["end"] - e["start"])
+        yaml = _import_yaml()
+        school = yaml.load(chunk, Loader=_Loader)[e["key"]]
+    except Exception:
+        return None  # no/stale/odd index: caller loads the full canon
+    return (e["key"], school) if isinstance(school, dict) else None
+
 # ---------- Domain Extraction ----------
 def parse_front_matter(md: str) -> Tuple[Dict[str, Any], str]:
     """
     Extract front-matter YAML from markdown.
     Returns: (front_matter_dict, remaining_body)
     """
+    yaml = _import_yaml()
+    # Common shape: '---' line, then YAML starting on the next line. Plain
+    # string scanning here; anything else goes through FRONT_MATTER.
+    nl = md.find('\n')
+    if md.startswith('---') and nl > 0 and md[3:nl].strip() == "" and md[nl + 1:nl + 2].strip():
+        start = nl + 1
+        end = md.find('\n---', start)
+        while end >= 0:
+            line_end = md.find('\n', end + 4)
+            if line_end < 0:
+                break
+            if md[end + 4:line_end].strip() == "":
+                # Closing '---' line; like '---\s*\n', also swallow blank lines after it
+                tail = md[line_end + 1:]
+                ws = tail[:len(tail) - len(tail.lstrip())]
+                rest = tail[ws.rfind('\n') + 1:]
+                return yaml.load(md[start:end + 1], Loader=_Loader) or {}, rest
+            end = md.find('\n---', end + 1)
+        return {}, md
+    
     m = FRONT_MATTER.match(md)
     if not m:
         return {}, md
-    y = yaml.safe_load(m.group('y')) or {}
+    y = yaml.load(m.group('y'), Loader=_Loader) or {}
     rest = md[m.end():]
     return y, rest
 
@@ -183,61 +652,48 @@ def extract_commentomancy_lore(prose: str) -> Dict[str, List[str]]:
         "guardrails": [...]
     }
     """
-    lore = {
-        "strategic_decisions": [],
-        "emergent_patterns": [],
-        "heart_imprints": [],
-        "evolution_pressure": [],
-        "sacred_truths": [],
-        "guardrails": []
-    }
-    
-    # Extract each commentomancy type
-    for match in COMMENTOMANCY_PATTERNS["strategic_decision"].finditer(prose):
-        lore["strategic_decisions"].append(match.group(1).strip())
-    
-    for match in COMMENTOMANCY_PATTERNS["emergent_pattern"].finditer(prose):
-        lore["emergent_patterns"].append(match.group(1).strip())
-    
-    for match in COMMENTOMANCY_PATTERNS["heart_imprint"].finditer(prose):
-        lore["heart_imprints"].append(match.group(1).strip())
-    
-    for match in COMMENTOMANCY_PATTERNS["evolution_pressure"].finditer(prose):
-        lore["evolution_pressure"].append(match.group(1).strip())
-    
-    for match in COMMENTOMANCY_PATTERNS["sacred_truth"].finditer(prose):
-        lore["sacred_truths"].append(match.group(1).strip())
-    
-    for match in COMMENTOMANCY_PATTERNS["guardrail"].finditer(prose):
-        lore["guardrails"].append(match.group(1).strip())
-    
-    # Dedupe preserving order
-    for key in lore:
-        lore[key] = list(dict.fromkeys(lore[key]))
+    lore = {key: [] for key in COMMENTOMANCY_LORE_KEYS.values()}
+    seen = {key: set() for key in lore}
+    
+    # One scan for all sigils; per-sigil end offsets keep each type's matches
+    # non-overlapping exactly as six separate finditer passes would
+    last_end = dict.fromkeys(COMMENTOMANCY_LORE_KEYS, -1)
+    for match in COMMENTOMANCY_COMBINED.finditer(prose):
+        kind = match.lastgroup
+        if match.start() < last_end[kind]:
+            continue
+        last_end[kind] = match.end(kind)
+        # Dedupe preserving order, as values arrive
+        key = COMMENTOMANCY_LORE_KEYS[kind]
+        value = match.group(match.lastindex + 1).strip()
+        if value not in seen[key]:
+            seen[key].add(value)
+            lore[key].append(value)
     
     return lore
 
-def detect_ops_cons_examples(sections: Dict[str, List[str]]) -> Tuple[List[str], List[str], List[str]]:
-    """Extract operations, constraints, examples from normalized sections."""
+def detect_ops_cons_examples(lists: Dict[str, List[str]], fences: List[str]) -> Tuple[List[str], List[str], List[str]]:
+    """Extract operations, constraints, examples from parse_markdown() lists + fences."""
     # Extract ✅ operations from "operations" sections (including "When to Use")
-    ops = extract_list(sections.get("operations", []), prefix_filter="✅")
+    ops = filter_items(lists.get("operations", []), prefix_filter="✅")
     # If no emoji-prefixed items found, try without filter
     if not ops:
-        ops = extract_list(sections.get("operations", []))
+        ops = filter_items(lists.get("operations", []))
     
     # Extract ❌ constraints from "constraints" sections (including "When to Use")
-    cons = extract_list(sections.get("constraints", []), prefix_filter="❌")
+    cons = filter_items(lists.get("constraints", []), prefix_filter="❌")
     # If no emoji-prefixed items found, try without filter
     if not cons:
-        cons = extract_list(sections.get("constraints", []))
+        cons = filter_items(lists.get("constraints", []))
     
-    # Extract fenced code blocks from ALL sections
-    exs = extract_fences(sum([v for v in sections.values()], []))
-    return ops, cons, exs
+    # Fenced code blocks from ALL sections (collected during the parse)
+    return ops, cons, fences
 
 def extract_ebnf_fragments(ebnf_text: str) -> Dict[str, str]:
     """Split EBNF into stable fragments (split by 2+ newlines)."""
-    chunks = [c.strip() + "\n" for c in re.split(r'\n{2,}', ebnf_text) if c.strip()]
+    # Plain split on blank lines: the stray '\n' pieces a 3+ newline run leaves
+    # behind are stripped/dropped, giving the same chunks as re.split(r'\n{2,}')
+    chunks = [c.strip() + "\n" for c in ebnf_text.split('\n\n') if c.strip()]
     return {f"fragment_{i}": chunks[i] for i in range(len(chunks))}
 
 def extract_grammar_map(mapping_md: str) -> Dict[str, str]:
@@ -247,10 +703,47 @@ def extract_grammar_map(mapping_md: str) -> Dict[str, str]:
     """
     out: Dict[str, str] = {}
     for ln in mapping_md.splitlines():
-        if ln.strip().startswith("|") and ln.strip().endswith("|") and ln.count("|") >= 3:
-            cells = [c.strip() for c in ln.strip("|").split("|")]
-            if len(cells) >= 2 and cells[0].lower() != "rule":
-                out[cells[0]] = cells[1]
+        ls = ln.strip()
+        if not (ls.startswith("|") and ls.endswith("|")):
+            continue
+        # Inner cells between the edge pipes; >= 2 cells means >= 3 pipes
+        cells = [c.strip() for c in ls[1:-1].split("|")]
+        if len(cells) >= 2 and cells[0].lower() != "rule":
+            out[cells[0]] = cells[1]
+    return out
+
+# Canonical code-comment sigils (schema channel)
+COMMENTOMANCY_SIGILS = {
+    "guardrail": "//!?",
+    "prereq": "//!",
+    "heart": "//<3",
+    "law": "///",
+    "lore": "//~",
+}
+COMMENTOMANCY_SIGIL_RE = re.compile("|".join(map(re.escape, COMMENTOMANCY_SIGILS.values())))
+
+# Line separators str.splitlines() honours beyond \n / \r\n
+_EXTRA_LINE_BREAKS = '\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+
+def sigil_lines(md: str) -> List[str]:
+    """
+    Stripped lines of `md` that contain a commentomancy sigil.
+    Jumps from match to match over the whole text instead of testing every
+    line; text with exotic separators (lone \r, \f, U+2028, ...) takes the
+    per-line path so lines split exactly as splitlines() does.
+    """
+    if md.count('\r') != md.count('\r\n') or any(c in md for c in _EXTRA_LINE_BREAKS):
+        return [ln.strip() for ln in md.splitlines() if COMMENTOMANCY_SIGIL_RE.search(ln)]
+    out = []
+    search = COMMENTOMANCY_SIGIL_RE.search
+    m = search(md)
+    while m:
+        start = md.rfind('\n', 0, m.start()) + 1
+        end = md.find('\n', m.end())
+        if end < 0:
+            end = len(md)
+        out.append(md[start:end].strip())
+        m = search(md, end + 1)
     return out
 
 def extract_commentomancy_schema(law_md: str, extra: List[Path]) -> Dict[str, Any]:
@@ -259,13 +752,7 @@ def extract_commentomancy_schema(law_md: str, extra: List[Path]) -> Dict[str, An
     Returns canonical sigils + policy + observed examples.
     """
     schema = {
-        "sigils": {
-            "guardrail": "//!?",
-            "prereq": "//!",
-            "heart": "//<3",
-            "law": "///",
-            "lore": "//~",
-        },
+        "sigils": dict(COMMENTOMANCY_SIGILS),
         "policy": {
             "safety_tier_requirements": {
                 "0": [],
@@ -277,29 +764,172 @@ def extract_commentomancy_schema(law_md: str, extra: List[Path]) -> Dict[str, An
         "observed_lines": []
     }
     
-    def scan(md: str):
-        for ln in md.splitlines():
-            if any(s in ln for s in schema["sigils"].values()):
-                schema["observed_lines"].append(ln.strip())
-    
-    scan(law_md)
+    schema["observed_lines"].extend(sigil_lines(law_md))
     for p in extra:
         if p.suffix.lower() == ".md":
-            scan(read_text(p))
+            schema["observed_lines"].extend(sigil_lines(read_text(p)))
     
     # Dedupe preserving order
     schema["observed_lines"] = list(dict.fromkeys(schema["observed_lines"]))
     return schema
 
+def parse_school(md_path: Path, sha: str, cache_dir: Optional[Path]) -> Dict[str, Any]:
+    """
+    Parse a school markdown file into front-matter, ops/cons/examples and prose lore.
+    Results are cached by the file's sha256.
+    """
+    parsed = _cache_get(cache_dir, sha, "school")
+    if parsed is not None:
+        return parsed
+    full = read_text(md_path)
+    fm, body = parse_front_matter(full)
+    _, fences, lists = parse_markdown(body)
+    ops, cons, exs = detect_ops_cons_examples(lists, fences)
+    parsed = {
+        "fm": fm,
+        "operations": ops,
+        "constraints": cons,
+        "examples": exs,
+        "prose_lore": extract_commentomancy_lore(body),
+    }
+    _cache_put(cache_dir, sha, "school", parsed)
+    return parsed
+
+@dataclass(slots=True)
+class SchoolEntry:
+    """One school's canon entry while building; plain dict only on output (to_dict)."""
+    id: Any
+    name: Optional[str]
+    emoji: Any
+    category: Optional[str]
+    purpose: Optional[str]
+    aliases: List[Any] = field(default_factory=list)
+    operations: List[str] = field(default_factory=list)
+    constraints: List[str] = field(default_factory=list)
+    examples: List[str] = field(default_factory=list)
+    law: Any = field(default_factory=dict)  # Structured Law from front-matter
+    lore: Any = field(default_factory=dict)  # Structured Lore from front-matter + commentomancy
+    spec: Dict[str, Any] = field(default_factory=dict)  # Legacy field for backwards compat
+    warnings: Optional[List[str]] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Canon dict in the lock's key order. Values are shared, not copied
+        (law/lore stay the same objects as spec's, as YAML anchors)."""
+        d = {
+            "id": self.id,
+            "name": self.name,
+            "emoji": self.emoji,
+            "category": self.category,
+            "purpose": self.purpose,
+            "aliases": self.aliases,
+            "operations": self.operations,
+            "constraints": self.constraints,
+            "examples": self.examples,
+            "law": self.law,
+            "lore": self.lore,
+            "spec": self.spec,
+        }
+        if self.warnings is not None:
+            d["warnings"] = self.warnings
+        return d
+
+def source_record(p: Path, root: Path) -> Tuple[str, Dict[str, str]]:
+    """Provenance record (sha256 + mtime) for a source file, keyed by root-relative path."""
+    rel_path = str(p).replace(str(root) + os.sep, "").replace("\\", "/")
+    st = p.stat()
+    return rel_path, {
+        "sha256": sha256_path(p, st),
+        "mtime": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(st.st_mtime))
+    }
+
+def _process_school(sid: Any, spec: Dict[str, Any], schools_dir: Path, root: Path,
+                    cache_dir: Optional[Path]) -> Tuple[str, SchoolEntry, Optional[Tuple[str, Dict[str, str]]]]:
+    """
+    Build one school's canon entry from its markdown file.
+    Returns: (school_key, entry, provenance_source or None)
+    """
+    file_rel = spec.get("file")
+    md_path = schools_dir / file_rel if file_rel else None
+    
+    entry = SchoolEntry(
+        id=int(sid) if str(sid).isdigit() else sid,
+        name=spec.get("name"),
+        emoji=spec.get("emoji", ""),
+        category=spec.get("category"),
+        purpose=spec.get("purpose"),
+    )
+    
+    source = None
+    if md_path and md_path.exists():
+        source = source_record(md_path, root)
+        parsed = parse_school(md_path, source[1]["sha256"], cache_dir)
+        fm = parsed["fm"]
+        
+        # Legacy fields (for backwards compatibility)
+        entry.operations = parsed["operations"]
+        entry.constraints = parsed["constraints"]
+        entry.examples = parsed["examples"]
+        
+        # Extract Law from front-matter YAML
+        if fm.get("law"):
+            entry.law = fm["law"]
+            # Also copy to legacy "spec" for backwards compat
+            entry.spec["law"] = fm["law"]
+        
+        # Extract Lore from front-matter YAML + prose commentomancy
+        lore_combined = {}
+        
+        # Front-matter Lore (structured)
+        if fm.get("lore"):
+            lore_combined = fm["lore"].copy()
+        
+        # Prose commentomancy Lore (append to structured)
+        prose_lore = parsed["prose_lore"]
+        for key, values in prose_lore.items():
+            if values:  # Only include non-empty lists
+                if key in lore_combined:
+                    # Merge: front-matter (dicts/lists) + prose (strings)
+                    existing = lore_combined[key]
+                    if isinstance(existing, list):
+                        # Append prose strings to list (can't dedupe dicts, only strings)
+                        lore_combined[key] = existing + values
+                    elif isinstance(existing, dict):
+                        # Keep structured dict from front-matter, add prose as separate key
+                        if "prose_annotations" not in lore_combined:
+                            lore_combined["prose_annotations"] = {}
+                        lore_combined["prose_annotations"][key] = values
+                    else:
+                        lore_combined[key] = values
+                else:
+                    lore_combined[key] = values
+        
+        if lore_combined:
+            entry.lore = lore_combined
+            # Also copy to legacy "spec" for backwards compat
+            entry.spec["lore"] = lore_combined
+        
+        # Front-matter wins for other metadata (safety_tier, tokens, etc.)
+        if fm:
+            entry.spec.update(fm)
+            if fm.get("aliases"):
+                entry.aliases = list(dict.fromkeys(fm["aliases"]))
+    else:
+        entry.warnings = ["missing_markdown_file"]
+    
+    return str(sid), entry, source
+
 # ---------- Build Canon ----------
+# At or above this many schools, school markdown is parsed in separate processes
+PROCESS_POOL_MIN_SCHOOLS = 64
+
 def build_canon(root: Path, args) -> Dict[str, Any]:
     """
     Walk lexicon and build canon.lock.yaml with full provenance.
     """
-    schools_map = load_yaml(root / args.schools)
+    cache_rel = getattr(args, 'cache_dir', CANON_CACHE_DIR)
+    cache_dir = root / cache_rel if cache_rel else None
+    schools_map = load_yaml_cached(root / args.schools, cache_dir)
     schools_dir = root / args.schools_dir
-    ebnf_text = read_text(root / args.ebnf)
-    mapping_md = read_text(root / args.grammar_map)
     law_md = read_text(root / args.law)
     comment_dir = root / args.commentomancy
     
@@ -312,11 +942,9 @@ def build_canon(root: Path, args) -> Dict[str, Any]:
     
     def track(p: Path):
         """Track file hash + mtime for provenance."""
-        rel_path = str(p).replace(str(root) + os.sep, "").replace("\\", "/")
-        prov["sources"][rel_path] = {
-            "sha256": sha256_path(p),
-            "mtime": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(p.stat().st_mtime))
-        }
+        rel_path, record = source_record(p, root)
+        prov["sources"][rel_path] = record
+        return record["sha256"]
     
     # Manifest baseline
     manifest = {
@@ -331,95 +959,42 @@ def build_canon(root: Path, args) -> Dict[str, Any]:
     }
     
     # Build schools (walk each markdown file)
-    schools: Dict[str, Any] = {}
-    for sid, spec in schools_map.get("schools", {}).items():
-        file_rel = spec.get("file")
-        md_path = schools_dir / file_rel if file_rel else None
-        
-        entry = {
-            "id": int(sid) if str(sid).isdigit() else sid,
-            "name": spec.get("name"),
-            "emoji": spec.get("emoji", ""),
-            "category": spec.get("category"),
-            "purpose": spec.get("purpose"),
-            "aliases": [],
-            "operations": [],
-            "constraints": [],
-            "examples": [],
-            "law": {},  # Structured Law from front-matter
-            "lore": {},  # Structured Lore from front-matter + commentomancy
-            "spec": {}  # Legacy field for backwards compat
-        }
-        
-        if md_path and md_path.exists():
-            track(md_path)
-            full = read_text(md_path)
-            fm, body = parse_front_matter(full)
-            sections = parse_sections(body)
-            ops, cons, exs = detect_ops_cons_examples(sections)
-            
-            # Legacy fields (for backwards compatibility)
-            entry["operations"] = ops
-            entry["constraints"] = cons
-            entry["examples"] = exs
-            
-            # Extract Law from front-matter YAML
-            if fm.get("law"):
-                entry["law"] = fm["law"]
-                # Also copy to legacy "spec" for backwards compat
-                entry["spec"]["law"] = fm["law"]
-            
-            # Extract Lore from front-matter YAML + prose commentomancy
-            lore_combined = {}
-            
-            # Front-matter Lore (structured)
-            if fm.get("lore"):
-                lore_combined = fm["lore"].copy()
-            
-            # Prose commentomancy Lore (append to structured)
-            prose_lore = extract_commentomancy_lore(body)
-            for key, values in prose_lore.items():
-                if values:  # Only include non-empty lists
-                    if key in lore_combined:
-                        # Merge: front-matter (dicts/lists) + prose (strings)
-                        existing = lore_combined[key]
-                        if isinstance(existing, list):
-                            # Append prose strings to list (can't dedupe dicts, only strings)
-                            lore_combined[key] = existing + values
-                        elif isinstance(existing, dict):
-                            # Keep structured dict from front-matter, add prose as separate key
-                            if "prose_annotations" not in lore_combined:
-                                lore_combined["prose_annotations"] = {}
-                            lore_combined["prose_annotations"][key] = values
-                        else:
-                            lore_combined[key] = values
-                    else:
-                        lore_combined[key] = values
-            
-            if lore_combined:
-                entry["lore"] = lore_combined
-                # Also copy to legacy "spec" for backwards compat
-                entry["spec"]["lore"] = lore_combined
-            
-            # Front-matter wins for other metadata (safety_tier, tokens, etc.)
-            if fm:
-                entry["spec"].update(fm)
-                if fm.get("aliases"):
-                    entry["aliases"] = list(dict.fromkeys(fm["aliases"]))
-        else:
-            entry["warnings"] = ["missing_markdown_file"]
-        
-        schools[str(sid)] = entry
+    # I/O + regex per file: fan out, then merge in map order (deterministic output)
+    school_items = list(schools_map.get("schools", {}).items())
+    comment_files = sorted(comment_dir.glob("*.md")) if comment_dir.exists() else []
+    school_args = ([sid for sid, _ in school_items], [spec for _, spec in school_items],
+                   repeat(schools_dir), repeat(root), repeat(cache_dir))
+    use_processes = len(school_items) >= PROCESS_POOL_MIN_SCHOOLS
+    if use_processes:
+        # Front-matter YAML + markdown scanning is GIL-bound; big lexicons get real cores
+        with ProcessPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+            school_results = list(pool.map(_process_school, *school_args, chunksize=8))
+    with ThreadPoolExecutor(max_workers=max(1, min(16, len(school_items)))) as pool:
+        if not use_processes:
+            school_results = list(pool.map(_process_school, *school_args))
+        comment_sources = list(pool.map(lambda p: source_record(p, root), comment_files))
+    
+    entries: Dict[str, SchoolEntry] = {}
+    for key, entry, source in school_results:
+        if source:
+            prov["sources"][source[0]] = source[1]
+        entries[key] = entry
+    schools = {key: entry.to_dict() for key, entry in entries.items()}
     
     # Grammar + Commentomancy
-    grammar = extract_ebnf_fragments(ebnf_text)
-    grammar_map = extract_grammar_map(mapping_md)
-    track(root / args.ebnf)
-    track(root / args.grammar_map)
-    
-    comment_files = sorted(comment_dir.glob("*.md")) if comment_dir.exists() else []
-    for p in comment_files:
-        track(p)
+    ebnf_sha = track(root / args.ebnf)
+    grammar = _cache_get(cache_dir, ebnf_sha, "ebnf")
+    if grammar is None:
+        grammar = extract_ebnf_fragments(read_text(root / args.ebnf))
+        _cache_put(cache_dir, ebnf_sha, "ebnf", grammar)
+    map_sha = track(root / args.grammar_map)
+    grammar_map = _cache_get(cache_dir, map_sha, "grammar_map")
+    if grammar_map is None:
+        grammar_map = extract_grammar_map(read_text(root / args.grammar_map))
+        _cache_put(cache_dir, map_sha, "grammar_map", grammar_map)
+    
+    for rel_path, record in comment_sources:
+        prov["sources"][rel_path] = record
     
     commentomancy = extract_commentomancy_schema(law_md, comment_files)
     track(root / args.law)
@@ -442,15 +1017,25 @@ def build_canon(root: Path, args) -> Dict[str, Any]:
     errs = []
     
     # A) token→school mapping resolves to exactly 19 unique schools
-    uniq = set(manifest["token_to_school_mapping"].values())
+    token_map = manifest["token_to_school_mapping"]
+    uniq = set(token_map.values())
     if len(uniq) != manifest["total_schools"]:
         errs.append(f"token_to_school_mapping yields {len(uniq)} unique schools, expected {manifest['total_schools']}")
     
-    # B) Every mapped school name exists in extracted schools
-    names = {v["name"] for v in schools.values() if v.get("name")}
-    for tok, sname in manifest["token_to_school_mapping"].items():
-        if sname not in names:
-            errs.append(f"grammar token '{tok}' maps to missing/unknown school '{sname}'")
+    # B) Every mapped school name exists in extracted schools (one error per missing school)
+    names = {e.name for e in entries.values() if e.name}
+    missing = uniq - names
+    if missing:
+        tokens_by_school: Dict[Any, List[str]] = {}
+        for tok, sname in token_map.items():
+            if sname in missing:
+                tokens_by_school.setdefault(sname, []).append(tok)
+        for sname, toks in tokens_by_school.items():
+            if len(toks) == 1:
+                errs.append(f"grammar token '{toks[0]}' maps to missing/unknown school '{sname}'")
+            else:
+                tok_list = ", ".join(f"'{t}'" for t in toks)
+                errs.append(f"grammar tokens {tok_list} map to missing/unknown school '{sname}'")
     
     # C) School count matches manifest
     if len(schools) != manifest["total_schools"]:
@@ -474,55 +1059,101 @@ ROSETTA_HEADER = """# 🔮 CodeCraft Rosetta Stone
 
 """
 
+ROSETTA_MANIFEST_BLOCK = """
+
+---
+## Embedded Machine Manifest
+
+```yaml
+# Machine-readable manifest
+# Full canon.lock.yaml used by validators/VM
+# Integrity hash computed over canonical view (excluding this block)
+
+metadata:
+  integrity:
+    sha256: <pending>
+    method: MEGA_canonical_block_exclusion
+    validator: scripts/lost_validate.py
+```"""
+
 def render_rosetta(canon: Dict[str, Any]) -> str:
     """Render Rosetta Stone from canon (integrity hash to be filled by fixer)."""
     ts = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime())
-    parts = [ROSETTA_HEADER.format(ts=ts)]
+    buf = io.StringIO()
+    w = buf.write
+    w(ROSETTA_HEADER.format(ts=ts))
     
+    # Every block after the header opens with its own line break
     for sid in sorted(canon["schools"], key=lambda k: int(k) if str(k).isdigit() else k):
         s = canon["schools"][sid]
-        parts.append(f"### {s.get('name', 'Unknown')}")
+        w(f"\n### {s.get('name', 'Unknown')}")
         if s.get("emoji"):
-            parts[-1] += f" {s['emoji']}"
+            w(f" {s['emoji']}")
         
         if s.get("purpose"):
-            parts.append(f"\n**Purpose:** {s['purpose']}\n")
+            w(f"\n\n**Purpose:** {s['purpose']}\n")
         
         if s.get("spec", {}).get("safety_tier") is not None:
-            parts.append(f"**Safety Tier:** {s['spec'].get('safety_tier')}\n")
+            w(f"\n**Safety Tier:** {s['spec'].get('safety_tier')}\n")
         
         if s.get("operations"):
-            parts.append("**Operations:**")
+            w("\n**Operations:**")
             for op in s["operations"]:
-                parts.append(f"- {op}")
-            parts.append("")
+                w(f"\n- {op}")
+            w("\n")
         
         if s.get("constraints"):
-            parts.append("**Constraints:**")
+            w("\n**Constraints:**")
             for c in s["constraints"]:
-                parts.append(f"- {c}")
-            parts.append("")
+                w(f"\n- {c}")
+            w("\n")
         
         if s.get("examples"):
-            parts.append("**Examples:**")
+            w("\n**Examples:**")
             for ex in s["examples"]:
-                parts.append(f"```codecraft\n{ex}\n```")
-            parts.append("")
-    
-    parts.append("\n---\n## Embedded Machine Manifest\n")
-    parts.append("```yaml")
-    parts.append("# Machine-readable manifest")
-    parts.append("# Full canon.lock.yaml used by validators/VM")
-    parts.append("# Integrity hash computed over canonical view (excluding this block)")
-    parts.append("")
-    parts.append("metadata:")
-    parts.append("  integrity:")
-    parts.append("    sha256: <pending>")
-    parts.append("    method: MEGA_canonical_block_exclusion")
-    parts.append("    validator: scripts/lost_validate.py")
-    parts.append("```")
-    
-    return "\n".join(parts)
+                w(f"\n```codecraft\n{ex}\n```")
+            w("\n")
+    
+    w(ROSETTA_MANIFEST_BLOCK)
+    return buf.getvalue()
+
+# ---------- Canon Integrity ----------
+CANON_INTEGRITY_METHOD = "sha256_compact_json_excluding_integrity"
+
+def canon_digest(canon: Dict[str, Any]) -> str:
+    """
+    sha256 over the canon's compact stdlib JSON form with meta.integrity removed.
+    Independent of the on-disk format (YAML/JSON) and of orjson being installed.
+    """
+    meta = {k: v for k, v in canon.get("meta", {}).items() if k != "integrity"}
+    view = dict(canon, meta=meta)
+    payload = json.dumps(view, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def read_embedded_integrity(canon_path: Path) -> Optional[str]:
+    """
+    meta.integrity.sha256 from a canon lock, None if absent.
+    YAML locks only parse the leading top-level `meta:` block, not the whole file.
+    """
+    yaml = _import_yaml()
+    try:
+        if canon_path.suffix.lower() == '.json':
+            meta = load_json(canon_path).get("meta")
+        else:
+            head: List[str] = []
+            with canon_path.open('r', encoding='utf-8') as f:
+                for ln in f:
+                    if head and ln[:1] not in (' ', '\t', '\n', '\r', '#'):
+                        break  # next top-level key
+                    head.append(ln)
+            if not head or not head[0].startswith('meta:'):
+                return None
+            meta = (yaml.load("".join(head), Loader=_Loader) or {}).get("meta")
+    except (OSError, ValueError, yaml.YAMLError, AttributeError):
+        return None
+    integrity = meta.get("integrity") if isinstance(meta, dict) else None
+    digest = integrity.get("sha256") if isinstance(integrity, dict) else None
+    return digest if isinstance(digest, str) else None
 
 # ---------- CLI Subcommands (MEGA's v2.2 Pattern) ----------
 def cmd_extract(args):
@@ -530,16 +1161,25 @@ def cmd_extract(args):
     root = Path(args.root if hasattr(args, 'root') else '.')
     canon = build_canon(root, args)
     
-    # Write canon.lock output (YAML or JSON based on extension)
+    # Optional: embed a content digest so `hash --embedded` needn't re-hash
+    if getattr(args, 'write_integrity', False):
+        canon["meta"]["integrity"] = {
+            "sha256": canon_digest(canon),
+            "method": CANON_INTEGRITY_METHOD,
+        }
+    
+    # Write canon.lock output (--format, else YAML or JSON based on extension)
     outp = root / args.out
-    ext = outp.suffix.lower()
+    fmt = getattr(args, 'format', None) or ('json' if outp.suffix.lower() == '.json' else 'yaml')
     
-    with outp.open('w', encoding='utf-8', newline='\n') as f:
-        if ext == '.json':
-            import json
-            json.dump(canon, f, indent=2, sort_keys=False)
-        else:
-            yaml.safe_dump(canon, f, sort_keys=False, allow_unicode=True)
+    if fmt == 'json':
+        outp.write_bytes(dumps_json(canon))
+    else:
+        buf = io.StringIO()
+        dump_yaml(canon, buf)
+        data = buf.getvalue().encode('utf-8')
+        outp.write_bytes(data)
+        write_school_index(outp, data, canon["schools"])
     
     print(f"✅ Wrote {outp}")
     
@@ -568,12 +1208,7 @@ def cmd_verify(args):
         return 1
     
     # Load canon
-    ext = canon_path.suffix.lower()
-    if ext == '.json':
-        import json
-        canon = json.loads(canon_path.read_text(encoding='utf-8'))
-    else:
-        canon = yaml.safe_load(canon_path.read_text(encoding='utf-8'))
+    canon = _load_canon(canon_path)
     
     # Basic schema checks
     errors = []
@@ -588,21 +1223,22 @@ def cmd_verify(args):
     passed_schools = []
     if "schools" in canon:
         for sid, school in canon["schools"].items():
-            school_name = school.get('name', f'School {sid}')
+            g = school.get
+            school_name = g('name', f'School {sid}')
             school_passed = True
             
             # Verify Law/Lore co-presence (Constitutional requirement)
-            if not school.get("law"):
+            if not g("law"):
                 errors.append(f"School {sid} ({school_name}) missing Law")
                 school_passed = False
-            if not school.get("lore"):
+            if not g("lore"):
                 errors.append(f"School {sid} ({school_name}) missing Lore")
                 school_passed = False
             
             # Verify canonical ID format (snake_case)
             if "id" in school:
                 school_id = str(school["id"])
-                if not re.match(r'^[a-z0-9_]+$', school_id):
+                if not CANONICAL_ID.match(school_id):
                     errors.append(f"School {sid} has non-canonical ID: {school_id}")
                     school_passed = False
             
@@ -612,14 +1248,11 @@ def cmd_verify(args):
     # Print passing schools first
     if passed_schools:
         print("✅ PASSED:")
-        for name in passed_schools:
-            print(f"  ✅ {name}")
-        print()
+        print("".join(f"  ✅ {name}\n" for name in passed_schools))
     
     if errors:
         print("❌ FAILED:", file=sys.stderr)
-        for e in errors:
-            print(f"  - {e}", file=sys.stderr)
+        print("\n".join(f"  - {e}" for e in errors), file=sys.stderr)
         return 1
     
     print("✅ All schools verified")
@@ -629,20 +1262,100 @@ def cmd_hash(args):
     """Print sha256 hash of canon.lock file (MEGA's v2.2 spec)."""
     canon_path = Path(args.canon)
     
-    if not canon_path.exists():
+    try:
+        st = canon_path.stat()
+    except OSError:
         print(f"ERROR: Canon file not found: {canon_path}", file=sys.stderr)
         return 1
     
-    digest = sha256_path(canon_path)
+    # --embedded: stored meta.integrity digest when present, else hash the
+    # raw bytes (never a parse/re-dump round trip)
+    digest = read_embedded_integrity(canon_path) if getattr(args, 'embedded', False) else None
+    if digest is None:
+        digest = sha256_path(canon_path, st)
     print(digest)
     return 0
 
+def _int_or(value: Any, default: int = 999) -> int:
+    """Sort key helper: ints sort by value, anything else (missing, str ids) last."""
+    return value if isinstance(value, int) else default
+
+def _print_school(key: Any, school: Dict[str, Any]) -> int:
+    """Print one school's scan report."""
+    # Each field looked up once
+    t = school.get
+    num, name, emoji, school_id = (
+        t("school_number", "?"), t("name", key), t("emoji", ""), t("id", key))
+    operations, constraints, examples = t("operations"), t("constraints"), t("examples")
+    
+    print(f"{'═' * 70}")
+    print(f"📜 SCHOOL {num}: {name} {emoji}")
+    print(f"{'═' * 70}")
+    print(f"ID: {school_id}")
+    print(f"Tokens: {', '.join(t('tokens', []))}")
+    print(f"Safety Tier: {t('safety_tier', 'unknown')}")
+    print()
+    
+    # Purpose
+    if "purpose" in school:
+        print(f"📖 PURPOSE:")
+        print(f"  {school['purpose']}")
+        print()
+    
+    # Operations
+    if operations:
+        print(f"⚙️  OPERATIONS ({len(operations)}):")
+        for i, op in enumerate(operations, 1):
+            print(f"  {i}. {op}")
+        print()
+    else:
+        print(f"⚠️  OPERATIONS: None defined in canon.lock")
+        print()
+    
+    # Constraints
+    if constraints:
+        print(f"🛡️  CONSTRAINTS ({len(constraints)}):")
+        for i, con in enumerate(constraints, 1):
+            print(f"  {i}. {con}")
+        print()
+    
+    # Examples
+    if examples:
+        print(f"✨ EXAMPLES ({len(examples)}):")
+        for i, ex in enumerate(examples, 1):
+            preview = ex[:100] + "..." if len(ex) > 100 else ex
+            print(f"  {i}. {preview}")
+        print()
+    
+    # Dependencies (if present)
+    if "dependencies" in school:
+        print(f"🔗 DEPENDENCIES:")
+        deps = school["dependencies"]
+        if isinstance(deps, dict):
+            if "mandatory" in deps:
+                print(f"  Mandatory: {', '.join(deps['mandatory']) if deps['mandatory'] else 'None'}")
+            if "recommended" in deps:
+                print(f"  Recommended: {', '.join(deps['recommended']) if deps['recommended'] else 'None'}")
+        else:
+            print(f"  {deps}")
+        print()
+    
+    # Provenance
+    if "provenance" in school:
+        prov = school["provenance"]
+        print(f"📂 PROVENANCE:")
+        print(f"  Source: {prov.get('source_file', 'unknown')}")
+        print(f"  Hash: {prov.get('file_hash', 'unknown')[:16]}...")
+        print()
+    
+    print(f"{'═' * 70}")
+    return 0
+
 def cmd_scan_school(args):
     """Scan canon.lock for school information (supports single school or ALL)."""
     # Default canon path if not provided
     if not hasattr(args, 'canon') or not args.canon:
         # Auto-detect: prefer codecraft-native, fallback to codecraft
-        from pathlib import Path
         native_canon = Path(__file__).parent.parent.parent.parent / "languages" / "codecraft-native" / "canon" / "canon.lock.yaml"
         legacy_canon = Path(__file__).parent.parent.parent.parent / "languages" / "codecraft" / "canon.lock.yaml"
         
@@ -662,9 +1375,14 @@ def cmd_scan_school(args):
         print(f"❌ ERROR: Canon file not found: {canon_path}", file=sys.stderr)
         return 1
     
+    # Single school: the extract-time index lets us parse just that school
+    if getattr(args, 'school', None):
+        hit = _indexed_school(canon_path, args.school.lower().strip())
+        if hit:
+            return _print_school(*hit)
+    
     # Load canon.lock
-    with open(canon_path, 'r', encoding='utf-8') as f:
-        canon = yaml.safe_load(f)
+    canon = _load_canon(canon_path)
     
     if not canon or "schools" not in canon:
         print(f"❌ ERROR: Invalid canon.lock format (no 'schools' key)", file=sys.stderr)
@@ -679,13 +1397,14 @@ def cmd_scan_school(args):
         print(f"   Source: {canon_path.name}")
         print(f"{'═' * 70}\n")
         
-        for key, school in sorted(schools.items(), key=lambda x: x[1].get("id", 999)):
-            num = school.get("id", "?")
-            name = school.get("name", key)
-            emoji = school.get("emoji", "")
-            ops_count = len(school.get("law", {}).get("operations", [])) if "law" in school else len(school.get("operations", []))
+        for key, school in sorted(schools.items(), key=lambda x: _int_or(x[1].get("id"))):
+            g = school.get
+            if "law" in school:
+                ops_count = len(g("law", {}).get("operations", []))
+            else:
+                ops_count = len(g("operations", []))
             
-            print(f"  {num:2}. {emoji} {name:20} - {ops_count:2} operations")
+            print(f"  {g('id', '?'):2}. {g('emoji', '')} {g('name', key):20} - {ops_count:2} operations")
         
         print(f"\n{'═' * 70}")
         print(f"💡 TIP: Use 'omni canon scan --school <number>' to see details")
@@ -693,183 +1412,150 @@ def cmd_scan_school(args):
         return 0
     
     # Find school by number or name
-    school_query = args.school.lower().strip()
-    target_school = None
-    school_key = None
-    
-    # Try exact numeric match first (e.g., "13")
-    if school_query.isdigit():
-        school_num = int(school_query)
-        for key, school in schools.items():
-            if school.get("school_number") == school_num:
-                target_school = school
-                school_key = key
-                break
+    entries = [(key, _school_number(school), str(school.get("id", "")), str(school.get("name", "")))
+               for key, school in schools.items()]
+    i = _match_school(args.school.lower().strip(), entries)
     
-    # Try name match (e.g., "thaumaturgy")
-    if not target_school:
-        for key, school in schools.items():
-            school_id = str(school.get("id", "")).lower()
-            school_name = str(school.get("name", "")).lower()
-            if school_query in school_id or school_query in school_name or school_query == key.lower():
-                target_school = school
-                school_key = key
-                break
-    
-    if not target_school:
+    if i is None:
         print(f"❌ ERROR: School '{args.school}' not found in canon.lock", file=sys.stderr)
         print(f"\n📜 Available schools:", file=sys.stderr)
-        for key, school in sorted(schools.items(), key=lambda x: x[1].get("school_number", 999)):
-            num = school.get("school_number", "?")
-            name = school.get("name", key)
-            print(f"  {num:2}. {name} ({school.get('id', key)})", file=sys.stderr)
+        for key, school in sorted(schools.items(), key=lambda x: _int_or(x[1].get("school_number"))):
+            g = school.get
+            print(f"  {g('school_number', '?'):2}. {g('name', key)} ({g('id', key)})", file=sys.stderr)
         return 1
     
-    # Display school information
-    num = target_school.get("school_number", "?")
-    name = target_school.get("name", school_key)
-    emoji = target_school.get("emoji", "")
-    school_id = target_school.get("id", school_key)
-    
-    print(f"{'═' * 70}")
-    print(f"📜 SCHOOL {num}: {name} {emoji}")
-    print(f"{'═' * 70}")
-    print(f"ID: {school_id}")
-    print(f"Tokens: {', '.join(target_school.get('tokens', []))}")
-    print(f"Safety Tier: {target_school.get('safety_tier', 'unknown')}")
-    print()
-    
-    # Purpose
-    if "purpose" in target_school:
-        print(f"📖 PURPOSE:")
-        print(f"  {target_school['purpose']}")
-        print()
-    
-    # Operations
-    if "operations" in target_school and target_school["operations"]:
-        print(f"⚙️  OPERATIONS ({len(target_school['operations'])}):")
-        for i, op in enumerate(target_school["operations"], 1):
-            print(f"  {i}. {op}")
-        print()
-    else:
-        print(f"⚠️  OPERATIONS: None defined in canon.lock")
-        print()
-    
-    # Constraints
-    if "constraints" in target_school and target_school["constraints"]:
-        print(f"🛡️  CONSTRAINTS ({len(target_school['constraints'])}):")
-        for i, con in enumerate(target_school["constraints"], 1):
-            print(f"  {i}. {con}")
-        print()
-    
-    # Examples
-    if "examples" in target_school and target_school["examples"]:
-        print(f"✨ EXAMPLES ({len(target_school['examples'])}):")
-        for i, ex in enumerate(target_school["examples"], 1):
-            preview = ex[:100] + "..." if len(ex) > 100 else ex
-            print(f"  {i}. {preview}")
-        print()
-    
-    # Dependencies (if present)
-    if "dependencies" in target_school:
-        print(f"🔗 DEPENDENCIES:")
-        deps = target_school["dependencies"]
-        if isinstance(deps, dict):
-            if "mandatory" in deps:
-                print(f"  Mandatory: {', '.join(deps['mandatory']) if deps['mandatory'] else 'None'}")
-            if "recommended" in deps:
-                print(f"  Recommended: {', '.join(deps['recommended']) if deps['recommended'] else 'None'}")
-        else:
-            print(f"  {deps}")
-        print()
-    
-    # Provenance
-    if "provenance" in target_school:
-        prov = target_school["provenance"]
-        print(f"📂 PROVENANCE:")
-        print(f"  Source: {prov.get('source_file', 'unknown')}")
-        print(f"  Hash: {prov.get('file_hash', 'unknown')[:16]}...")
-        print()
-    
-    print(f"{'═' * 70}")
-    return 0
+    school_key = entries[i][0]
+    return _print_school(school_key, schools[school_key])
 
 # ---------- CLI ----------
-def main():
-    ap = argparse.ArgumentParser(description="Rosetta Archaeologist v2.2 - Extract THE LAW from lexicon")
-    
-    # Check if using legacy single-command mode (backward compatibility)
-    if '--out' in sys.argv and 'extract' not in sys.argv:
-        # Legacy mode: default to extract subcommand
-        args_legacy = argparse.Namespace()
-        args_legacy.root = '.'
-        args_legacy.schools = 'lexicon/schools.canonical.yaml'
-        args_legacy.schools_dir = 'lexicon/02_ARCANE_SCHOOLS'
-        args_legacy.ebnf = 'lexicon/grammar/lexicon.ebnf'
-        args_legacy.grammar_map = 'lexicon/grammar/EBNF_TO_PARSER_MAPPING.md'
-        args_legacy.law = 'spec/LAW_AND_LORE_PROTOCOL.md'
-        args_legacy.commentomancy = 'lexicon/commentomancy'
-        args_legacy.out = 'canon.lock.yaml'
-        args_legacy.render_rosetta = False
-        args_legacy.rosetta_path = 'CODECRAFT_ROSETTA_STONE.md'
-        
-        # Parse legacy args
-        legacy_parser = argparse.ArgumentParser()
-        legacy_parser.add_argument('--root', default='.')
-        legacy_parser.add_argument('--schools', default='lexicon/schools.canonical.yaml')
-        legacy_parser.add_argument('--schools_dir', default='lexicon/02_ARCANE_SCHOOLS')
-        legacy_parser.add_argument('--ebnf', default='lexicon/grammar/lexicon.ebnf')
-        legacy_parser.add_argument('--grammar_map', default='lexicon/grammar/EBNF_TO_PARSER_MAPPING.md')
-        legacy_parser.add_argument('--law', default='spec/LAW_AND_LORE_PROTOCOL.md')
-        legacy_parser.add_argument('--commentomancy', default='lexicon/commentomancy')
-        legacy_parser.add_argument('--out', default='canon.lock.yaml')
-        legacy_parser.add_argument('--render_rosetta', action='store_true')
-        legacy_parser.add_argument('--rosetta_path', default='CODECRAFT_ROSETTA_STONE.md')
-        args = legacy_parser.parse_args()
-        
-        sys.exit(cmd_extract(args))
-    
-    # Modern subcommand mode (MEGA's v2.2 pattern)
-    sub = ap.add_subparsers(dest="cmd", required=True, help="Subcommands")
-    
-    # extract subcommand
+# Value options shared by `extract` and the legacy `--out` mode: (flag, default, help)
+_EXT_ARGS: Tuple[Tuple[str, str, str], ...] = (
+    ('--root', '.', "CodeCraft repo root"),
+    ('--lexicon', './lexicon', "Lexicon directory"),
+    ('--schools', 'lexicon/schools.canonical.yaml', "schools.canonical.yaml"),
+    ('--schools_dir', 'lexicon/02_ARCANE_SCHOOLS', "School markdown directory"),
+    ('--ebnf', 'lexicon/grammar/lexicon.ebnf', "EBNF grammar file"),
+    ('--grammar_map', 'lexicon/grammar/EBNF_TO_PARSER_MAPPING.md', "Grammar mapping"),
+    ('--law', 'spec/LAW_AND_LORE_PROTOCOL.md', "Law & Lore protocol"),
+    ('--commentomancy', 'lexicon/commentomancy', "Commentomancy directory"),
+    ('--spec', '2.2', "Canon spec version"),
+    ('--rosetta_path', 'CODECRAFT_ROSETTA_STONE.md', "Rosetta output"),
+    ('--cache_dir', str(CANON_CACHE_DIR), "Parse cache directory (relative paths are under root; '' disables)"),
+)
+# store_true switches: (flag, help)
+_EXT_SWITCHES: Tuple[Tuple[str, str], ...] = (
+    ('--render_rosetta', "Render Rosetta Stone"),
+    ('--write_integrity', "Embed meta.integrity (content sha256) for 'hash --embedded'"),
+)
+
+def _add_extract_args(parser: argparse.ArgumentParser) -> None:
+    for flag, default, help_text in _EXT_ARGS:
+        parser.add_argument(flag, default=default, help=help_text)
+    for flag, help_text in _EXT_SWITCHES:
+        parser.add_argument(flag, action='store_true', help=help_text)
+
+def _build_extract(sub):
     p_ext = sub.add_parser("extract", help="Extract canon from lexicon sources")
-    p_ext.add_argument('--root', default='.', help="CodeCraft repo root")
-    p_ext.add_argument('--lexicon', default='./lexicon', help="Lexicon directory")
-    p_ext.add_argument('--schools', default='lexicon/schools.canonical.yaml', help="schools.canonical.yaml")
-    p_ext.add_argument('--schools_dir', default='lexicon/02_ARCANE_SCHOOLS', help="School markdown directory")
-    p_ext.add_argument('--ebnf', default='lexicon/grammar/lexicon.ebnf', help="EBNF grammar file")
-    p_ext.add_argument('--grammar_map', default='lexicon/grammar/EBNF_TO_PARSER_MAPPING.md', help="Grammar mapping")
-    p_ext.add_argument('--law', default='spec/LAW_AND_LORE_PROTOCOL.md', help="Law & Lore protocol")
-    p_ext.add_argument('--commentomancy', default='lexicon/commentomancy', help="Commentomancy directory")
-    p_ext.add_argument('--out', required=True, help="Output canon lock file (.yaml or .json)")
-    p_ext.add_argument('--spec', default='2.2', help="Canon spec version")
-    p_ext.add_argument('--render_rosetta', action='store_true', help="Render Rosetta Stone")
-    p_ext.add_argument('--rosetta_path', default='CODECRAFT_ROSETTA_STONE.md', help="Rosetta output")
-    
-    # verify subcommand
+    _add_extract_args(p_ext)
+    p_ext.add_argument('--out', required=True, help="Output canon lock file (.yaml, or .json: compact and fastest to write)")
+    p_ext.add_argument('--format', choices=['yaml', 'json'], default=None,
+                       help="Output format (default: from --out extension)")
+
+def _build_verify(sub):
     p_ver = sub.add_parser("verify", help="Verify canon.lock schema and integrity")
     p_ver.add_argument('--canon', required=True, help="Path to canon.lock file")
-    
-    # hash subcommand
+
+def _build_hash(sub):
     p_hash = sub.add_parser("hash", help="Print sha256 hash of canon.lock")
     p_hash.add_argument('--canon', required=True, help="Path to canon.lock file")
-    
+    p_hash.add_argument('--embedded', action='store_true',
+                        help="Print the embedded meta.integrity digest if present (no re-hash)")
+
+def _build_scan(sub):
     # scan subcommand (NEW - Oracle's request)
     p_scan = sub.add_parser("scan", help="Scan canon.lock for specific school information")
     p_scan.add_argument('--canon', required=True, help="Path to canon.lock file")
     p_scan.add_argument('--school', required=True, help="School number (e.g., 13) or name (e.g., thaumaturgy)")
+
+# Subcommand name → (subparser builder, handler); listing order = help order
+_DISPATCH = {
+    "extract": (_build_extract, cmd_extract),
+    "verify": (_build_verify, cmd_verify),
+    "hash": (_build_hash, cmd_hash),
+    "scan": (_build_scan, cmd_scan_school),
+}
+
+# Plain forms main() parses without argparse: subcommand → (required options, switches)
+_FAST_FORMS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "verify": (("--canon",), ()),
+    "hash": (("--canon",), ("--embedded",)),
+    "scan": (("--canon", "--school"), ()),
+}
+
+def _fast_args(argv: List[str]) -> Optional[argparse.Namespace]:
+    """
+    Namespace for `verify|hash|scan --opt value ...` given with separate values,
+    each flag once and spelled in full. None for anything else (help, `--opt=v`,
+    abbreviations, missing/dash-leading values), which argparse then handles.
+    """
+    if not argv or argv[0] not in _FAST_FORMS:
+        return None
+    options, switches = _FAST_FORMS[argv[0]]
+    values: Dict[str, Any] = {}
+    i = 1
+    while i < len(argv):
+        tok = argv[i]
+        if tok in values:
+            return None
+        if tok in switches:
+            values[tok] = True
+            i += 1
+        elif tok in options and i + 1 < len(argv) and not argv[i + 1].startswith('-'):
+            values[tok] = argv[i + 1]
+            i += 2
+        else:
+            return None
+    if any(opt not in values for opt in options):
+        return None
+    ns = argparse.Namespace(cmd=argv[0])
+    for flag in options + switches:
+        setattr(ns, flag[2:], values.get(flag, False))
+    return ns
+
+@lru_cache(maxsize=1)
+def _legacy_args(argv: Tuple[str, ...]) -> argparse.Namespace:
+    """Parse legacy single-command flags (`--out ...` without `extract`), once per argv."""
+    legacy_parser = argparse.ArgumentParser()
+    _add_extract_args(legacy_parser)
+    legacy_parser.add_argument('--out', default='canon.lock.yaml')
+    return legacy_parser.parse_args(list(argv))
+
+def main():
+    # Check if using legacy single-command mode (backward compatibility)
+    if '--out' in sys.argv and 'extract' not in sys.argv:
+        # Legacy mode: default to extract subcommand
+        sys.exit(cmd_extract(_legacy_args(tuple(sys.argv[1:]))))
     
-    args = ap.parse_args()
+    # verify/hash/scan in their plain form skip building argparse entirely
+    args = _fast_args(sys.argv[1:])
+    if args is not None:
+        sys.exit(_DISPATCH[args.cmd][1](args))
+    
+    ap = argparse.ArgumentParser(description="Rosetta Archaeologist v2.2 - Extract THE LAW from lexicon")
+    
+    # Modern subcommand mode (MEGA's v2.2 pattern)
+    sub = ap.add_subparsers(dest="cmd", required=True, help="Subcommands")
     
-    if args.cmd == "extract":
-        sys.exit(cmd_extract(args))
-    elif args.cmd == "verify":
-        sys.exit(cmd_verify(args))
-    elif args.cmd == "hash":
-        sys.exit(cmd_hash(args))
-    elif args.cmd == "scan":
-        sys.exit(cmd_scan_school(args))
+    # Only build the subparser being invoked; all of them for help/unknown
+    wanted = sys.argv[1] if len(sys.argv) > 1 else None
+    if wanted in _DISPATCH:
+        _DISPATCH[wanted][0](sub)
+    else:
+        for build, _ in _DISPATCH.values():
+            build(sub)
+    
+    args = ap.parse_args()
+    sys.exit(_DISPATCH[args.cmd][1](args))
 
 if __name__ == "__main__":
     main()
@@ -26,9 +26,10 @@ Law: Charter V1.2 compliant - Federation pattern only
 """
 import json
 import logging
+import re
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Literal
 from dataclasses import dataclass, asdict
 
 # Federation Heart Integration (pip installed as seraphina-federation)
@@ -41,6 +42,19 @@ except ImportError as e:
 
 logger = logging.getLogger("Omni.Core.CommitHistoryBuilder")
 
+# git log line shapes (see scan_repository for the --pretty format);
+# hashes are 40 hex digits in SHA-1 repos and 64 in SHA-256 ones
+_HEADER_RE = re.compile(r'^([0-9a-f]{7,64})\|([^|]*)\|(.+)$')
+_NUMSTAT_RE = re.compile(r'^(\S+)\t(\S+)\t')
+
+# History scope → git log revision flags
+LogScope = Literal["all", "head", "first_parent"]
+_SCOPE_FLAGS = {
+    "all": ['--all'],                             # Every ref (multi-machine branches)
+    "head": [],                                   # HEAD history only
+    "first_parent": ['--first-parent', 'HEAD'],   # Mainline only
+}
+
 
 @dataclass
 class CommitRecord:
@@ -103,25 +117,31 @@ class CommitHistoryBuilder:
         
         self.infra_root = infra_root or settings.get_infrastructure_root()
         self._cartography = settings.cartography
+        self._governance_paths: Dict[str, Path] = {}  # subpath -> resolved path
+        self._commits_dir_created = False
         
         logger.info(f"📜 CommitHistoryBuilder initialized")
         logger.info(f"   - Infrastructure: {self.infra_root}")
         logger.info(f"   - Heart Available: {settings.heart_available}")
     
     def _get_governance_path(self, subpath: str = "") -> Path:
-        """Get governance path using Heart or fallback."""
-        if self._cartography:
-            gov = self._cartography.resolve_path("governance")
-            return gov / subpath if subpath else gov
-        else:
-            # Fallback
-            gov = self.infra_root / "governance"
-            return gov / subpath if subpath else gov
+        """Get governance path using Heart or fallback (memoized per builder)."""
+        path = self._governance_paths.get(subpath)
+        if path is None:
+            if self._cartography:
+                gov = self._cartography.resolve_path("governance")
+            else:
+                # Fallback
+                gov = self.infra_root / "governance"
+            path = self._governance_paths[subpath] = gov / subpath if subpath else gov
+        return path
     
     def _get_commits_registry_path(self, repo_name: str) -> Path:
         """Get path to commit history file for a repository."""
         commits_dir = self._get_governance_path("registry/commits")
-        commits_dir.mkdir(parents=True, exist_ok=True)
+        if not self._commits_dir_created:
+            commits_dir.mkdir(parents=True, exist_ok=True)
+            self._commits_dir_created = True
         return commits_dir / f"{repo_name}_commit_history.json"
     
     def _load_repo_inventory(self) -> List[Dict]:
@@ -176,29 +196,33 @@ class CommitHistoryBuilder:
         in_message = False
         message_lines = []
         
-        lines = log_output.split('\n')
+        # Hoist hot lookups out of the per-line loop
+        commits_append = commits.append
+        msg_append = message_lines.append
+        header_match = _HEADER_RE.match
+        numstat_match = _NUMSTAT_RE.match
         
-        for line in lines:
+        for line in log_output.split('\n'):
             # Start of new commit
             if line == 'COMMIT_START':
                 # Save previous commit
                 if current_commit:
                     # Clean up message
                     current_commit.message = '\n'.join(message_lines).strip()
-                    commits.append(current_commit)
-                    message_lines = []
+                    commits_append(current_commit)
+                    message_lines.clear()
                 
                 current_commit = None
                 in_message = False
                 continue
             
             # Commit header: hash|author|date
-            if current_commit is None and '|' in line and not line.startswith('\t'):
-                parts = line.split('|', 2)
-                if len(parts) == 3:
-                    hash_val, author, date = parts
+            if current_commit is None:
+                match = header_match(line)
+                if match:
+                    hash_val, author, date = match.groups()
                     current_commit = CommitRecord(
-                        hash=hash_val.strip(),
+                        hash=hash_val,
                         author=author.strip(),
                         date=date.strip(),
                         message='',  # Will be filled in later
@@ -211,7 +235,7 @@ class CommitHistoryBuilder:
             # Message start
             if line == 'MSG_START':
                 in_message = True
-                message_lines = []
+                message_lines.clear()
                 continue
             
             # Message end
@@ -221,26 +245,20 @@ class CommitHistoryBuilder:
             
             # Message content
             if in_message:
-                message_lines.append(line)
+                msg_append(line)
                 continue
             
             # File stat: insertions\tdeletions\tfilename
-            if '\t' in line and current_commit and not in_message:
-                parts = line.split('\t')
-                if len(parts) >= 3:
-                    try:
-                        ins = parts[0].strip()
-                        dels = parts[1].strip()
-                        
-                        insertions = int(ins) if ins and ins != '-' else 0
-                        deletions = int(dels) if dels and dels != '-' else 0
-                        
-                        current_commit.files_changed += 1
-                        current_commit.insertions += insertions
-                        current_commit.deletions += deletions
-                    except ValueError:
-                        # Binary files show as "-"
-                        current_commit.files_changed += 1
+            match = numstat_match(line)
+            if match:
+                ins, dels = match.groups()
+                current_commit.files_changed += 1
+                try:
+                    current_commit.insertions += int(ins) if ins != '-' else 0
+                    current_commit.deletions += int(dels) if dels != '-' else 0
+                except ValueError:
+                    # Binary files show as "-"
+                    pass
         
         # Don't forget the last commit
         if current_commit:
@@ -291,7 +309,8 @@ class CommitHistoryBuilder:
             net_lines=total_ins - total_dels
         )
     
-    def scan_repository(self, repo_path: Path, repo_name: str, github_url: Optional[str] = None) -> Optional[CommitHistoryRegistry]:
+    def scan_repository(self, repo_path: Path, repo_name: str, github_url: Optional[str] = None,
+                        scope: LogScope = "all") -> Optional[CommitHistoryRegistry]:
         """
         Scan a single repository's commit history.
         
@@ -299,6 +318,11 @@ class CommitHistoryBuilder:
             repo_path: Path to git repository
             repo_name: Repository name
             github_url: Optional GitHub URL
+            scope: Which history to walk:
+                   "all" - every ref; only needed to preserve multi-machine
+                           branches (Phoenix Resurrection)
+                   "head" - commits reachable from HEAD
+                   "first_parent" - HEAD mainline only (skips merged-in branches)
             
         Returns:
             CommitHistoryRegistry or None if error
@@ -316,7 +340,7 @@ class CommitHistoryBuilder:
         # %B = full commit message (subject + body), not just %s (subject only)
         stdout, err = self._run_git_command(
             repo_path,
-            ['log', '--all', '--pretty=format:COMMIT_START%n%H|%an|%aI%nMSG_START%n%B%nMSG_END', '--numstat']
+            ['log', *_SCOPE_FLAGS[scope], '--pretty=format:COMMIT_START%n%H|%an|%aI%nMSG_START%n%B%nMSG_END', '--numstat']
         )
         
         if err:
@@ -351,7 +375,8 @@ class CommitHistoryBuilder:
             stats=stats
         )
     
-    def build_single(self, repo_path: Path, repo_name: str = None, github_url: Optional[str] = None) -> Dict[str, Any]:
+    def build_single(self, repo_path: Path, repo_name: str = None, github_url: Optional[str] = None,
+                     scope: LogScope = "all") -> Dict[str, Any]:
         """
         Build commit history for a single repository and write to registry.
         
@@ -359,6 +384,7 @@ class CommitHistoryBuilder:
             repo_path: Path to repository
             repo_name: Optional repo name (defaults to folder name)
             github_url: Optional GitHub URL
+            scope: History scope passed to scan_repository
             
         Returns:
             Dict with status, commit_count, registry_file (on success) or error (on failure)
@@ -369,7 +395,7 @@ class CommitHistoryBuilder:
             repo_name = repo_path.name
         
         # Scan repository
-        registry = self.scan_repository(repo_path, repo_name, github_url)
+        registry = self.scan_repository(repo_path, repo_name, github_url, scope=scope)
         
         if not registry:
             return {
@@ -400,13 +426,14 @@ class CommitHistoryBuilder:
                 'error': f'Failed to write registry: {str(e)}'
             }
     
-    def build_all(self, repos: List[Dict] = None) -> Dict[str, bool]:
+    def build_all(self, repos: List[Dict] = None, scope: LogScope = "all") -> Dict[str, bool]:
         """
         Build commit histories for all repositories with local paths.
         
         Args:
             repos: Optional list of repo dicts (from inventory)
                    If None, loads from repo_inventory.json
+            scope: History scope passed to scan_repository
             
         Returns:
             Dict mapping repo name to success status
@@ -437,7 +464,8 @@ class CommitHistoryBuilder:
             success = self.build_single(
                 Path(local_path),
                 repo_name=repo.get('name'),
-                github_url=repo.get('url')
+                github_url=repo.get('url'),
+                scope=scope
             )
             
             results[repo.get('name')] = success
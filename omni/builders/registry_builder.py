@@ -16,13 +16,21 @@ Sources:
 Output:
 - PROJECT_REGISTRY_V1.yaml - canonical project registry
 """
+import hashlib
 import json
 import logging
+import mmap
+import os
+import pickle
 import subprocess
+import sys
+import threading
+from collections import Counter
+from functools import lru_cache
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Set
-from dataclasses import dataclass, asdict
+from typing import IO, Callable, Dict, FrozenSet, List, Any, Optional, Set, Tuple
+from dataclasses import dataclass
 
 from omni.core.identity_engine import (
     ProjectIdentity,
@@ -31,10 +39,176 @@ from omni.core.identity_engine import (
     NAMESPACE_CMP
 )
 
+# Optional: orjson for JSON parsing and the JSON registry (falls back to stdlib json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger("Omni.Core.RegistryBuilder")
 
+# Heart integration scan: ripgrep pattern for files importing federation_heart,
+# and an upper bound on how long the scan may run
+HEART_IMPORT_PATTERN = r"^\s*(from|import)\s+federation_heart\b"
+RG_TIMEOUT_SECONDS = 30
+
+# PyYAML is imported on first use; libyaml-backed classes when available
+_yaml = None
+_YLoader = _YDumper = None
+
+
+def _load_yaml():
+    """Import PyYAML on first use, preferring the libyaml C bindings."""
+    global _yaml, _YLoader, _YDumper
+    if _yaml is None:
+        import yaml
+        try:
+            from yaml import CSafeLoader as loader, CSafeDumper as dumper
+        except ImportError:
+            from yaml import SafeLoader as loader, SafeDumper as dumper
+        _YLoader, _YDumper = loader, dumper
+        _yaml = yaml
+    return _yaml
+
+
+def _load_registry_header(path: Path) -> Any:
+    """
+    Parse a saved YAML registry up to its top-level `projects:` key.
+    
+    save() writes stats ahead of the project list, so the degradation guard
+    never needs the projects. Without the marker the whole file is parsed.
+    """
+    yaml = _load_yaml()
+    head = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith("projects:"):
+                break
+            head.append(line)
+    return yaml.load("".join(head), Loader=_YLoader)
+
+
+def _load_stats_sidecar(sidecar_path: Path, registry_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Return the stats recorded for registry_path by its last save().
+    
+    The sidecar stores the registry file's size and mtime_ns; if the file
+    changed since (or either is missing/unreadable) this returns None.
+    """
+    try:
+        with open(sidecar_path, 'r', encoding='utf-8') as f:
+            sidecar = json.load(f)
+        st = registry_path.stat()
+        if sidecar.get('size') == st.st_size and sidecar.get('mtime_ns') == st.st_mtime_ns:
+            return sidecar.get('stats')
+    except (OSError, ValueError, AttributeError):
+        pass
+    return None
+
+
+def _write_atomic(path: Path, write: Callable[[IO], Any], binary: bool = False) -> None:
+    """Write path via a fsync'd temp file + os.replace, so readers never see a partial file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, 'wb' if binary else 'w', encoding=None if binary else 'utf-8') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _dumps_json(obj: Any) -> bytes:
+    """Indented UTF-8 JSON, via orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _intern(value: Any) -> Any:
+    """sys.intern for strings; other values pass through unchanged."""
+    return sys.intern(value) if type(value) is str else value
+
+
+# =============================================================================
+# Source File Cache
+# =============================================================================
+# Parsed source files are memoized per process, keyed by (path, mtime_ns, size):
+# an edited file gets a new key, so nothing needs explicit invalidation.
+# Across runs the same key names a pickle under REGISTRY_CACHE_DIR.
+# Callers must treat the returned data as read-only.
+
+REGISTRY_CACHE_DIR = Path(
+    os.getenv("OMNI_REGISTRY_CACHE_DIR") or Path.home() / ".cache" / "omni" / "registry_builder"
+)
+
+
+def _disk_cached(path_str: str, mtime_ns: int, size: int, read: Callable[[str, int], Any]) -> Any:
+    """Return read(path_str, size), via a pickle keyed by the file's identity."""
+    stem = f"{Path(path_str).name}.{hashlib.sha1(path_str.encode('utf-8')).hexdigest()[:12]}"
+    cache_path = REGISTRY_CACHE_DIR / f"{stem}.{mtime_ns}.{size}.pkl"
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.debug("   Ignoring unreadable parse cache %s: %s", cache_path, e)
+    
+    data = read(path_str, size)
+    try:
+        REGISTRY_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Drop pickles of earlier versions of this file
+        for stale in REGISTRY_CACHE_DIR.glob(f"{stem}.*.pkl"):
+            stale.unlink(missing_ok=True)
+        _write_atomic(cache_path, lambda f: pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL), binary=True)
+    except OSError as e:
+        logger.debug("   Could not write parse cache %s: %s", cache_path, e)
+    return data
+
+
+def _read_yaml(path_str: str, size: int) -> Any:
+    yaml = _load_yaml()
+    with open(path_str, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_YLoader)
+
+
+# JSON files at least this large are parsed straight from an mmap (orjson only);
+# below it the mmap setup costs more than reading the bytes
+JSON_MMAP_MIN_BYTES = 1 << 20
+
 
-@dataclass
+def _read_json(path_str: str, size: int) -> Any:
+    if ORJSON_AVAILABLE:
+        with open(path_str, 'rb') as f:
+            if size >= JSON_MMAP_MIN_BYTES:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    return orjson.loads(view)
+            return orjson.loads(f.read())
+    with open(path_str, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=16)
+def _parse_yaml_file(path_str: str, mtime_ns: int, size: int) -> Any:
+    return _disk_cached(path_str, mtime_ns, size, _read_yaml)
+
+
+@lru_cache(maxsize=16)
+def _parse_json_file(path_str: str, mtime_ns: int, size: int) -> Any:
+    return _disk_cached(path_str, mtime_ns, size, _read_json)
+
+
+def _load_cached(path: Path, parser) -> Any:
+    """Parse path with a cached parser, reusing the result while the file is unchanged."""
+    st = path.stat()
+    return parser(str(path), st.st_mtime_ns, st.st_size)
+
+
+@dataclass(slots=True)
 class RegistryProject:
     """A project entry in the registry."""
     uuid: str
@@ -56,10 +230,25 @@ class RegistryProject:
     heart_import_count: int = 0
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        # Explicit literal: same shape as dataclasses.asdict, without its recursive deepcopy
+        return {
+            "uuid": self.uuid,
+            "name": self.name,
+            "display_name": self.display_name,
+            "github_url": self.github_url,
+            "local_paths": list(self.local_paths),
+            "classification": self.classification,
+            "status": self.status,
+            "origin": self.origin,
+            "visibility": self.visibility,
+            "updated_at": self.updated_at,
+            "notes": self.notes,
+            "heart_connected": self.heart_connected,
+            "heart_import_count": self.heart_import_count,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class ProjectRegistry:
     """The complete project registry."""
     version: str
@@ -74,7 +263,7 @@ class ProjectRegistry:
             "generated_at": self.generated_at,
             "namespace": self.namespace,
             "stats": self.stats,
-            "projects": [p.to_dict() for p in self.projects]
+            "projects": list(map(RegistryProject.to_dict, self.projects))
         }
 
 
@@ -83,6 +272,10 @@ class RegistryBuilder:
     Builds PROJECT_REGISTRY_V1.yaml from authoritative sources.
     """
     
+    # Set once _find_local_only_projects does real discovery; until then
+    # build() skips collecting the known-URL set it would be handed
+    _LOCAL_ONLY_IMPL = False
+    
     def __init__(self, settings_module=None):
         if settings_module is None:
             from omni.config import settings
@@ -91,8 +284,10 @@ class RegistryBuilder:
             self.settings = settings_module
         
         self.infra_root = self.settings.get_infrastructure_root()
-        logger.info(f"📦 RegistryBuilder initialized")
-        logger.info(f"   - Infrastructure: {self.infra_root}")
+        # Lowercase, forward-slash infra root + "/" for string-level relativizing
+        self._infra_prefix = (str(self.infra_root).replace("\\", "/").rstrip("/") + "/").lower()
+        logger.info("📦 RegistryBuilder initialized")
+        logger.info("   - Infrastructure: %s", self.infra_root)
     
     def build(
         self,
@@ -118,11 +313,11 @@ class RegistryBuilder:
         
         # 0. Load Local Overrides (Tier 0 Truth)
         overrides_map = self._load_overrides()
-        logger.info(f"   Loaded {len(overrides_map)} local overrides")
+        logger.info("   Loaded %d local overrides", len(overrides_map))
 
         # 1. Load CMP Database (THE DRIVER)
         cmp_projects = self._load_cmp_data()
-        logger.info(f"   ✅ Loaded {len(cmp_projects)} projects from CMP database")
+        logger.info("   ✅ Loaded %d projects from CMP database", len(cmp_projects))
         
         # 2. Load GitHub inventory as LOOKUP map
         if inventory_path is None:
@@ -131,134 +326,70 @@ class RegistryBuilder:
             )
         
         github_map = self._load_github_inventory_as_map(inventory_path)
-        logger.info(f"   Loaded {len(github_map)} GitHub repos (enrichment)")
+        logger.info("   Loaded %d GitHub repos (enrichment)", len(github_map))
         
         # 3. Load exclusions
         exclusions = self._load_exclusions()
-        logger.info(f"   Loaded {len(exclusions)} exclusions")
-        
-        # 4. Scan local filesystem for git repos (maps URL -> local path)
-        local_path_map = {}
+        logger.info("   Loaded %d exclusions", len(exclusions))
+        
+        # 4. Scan local filesystem for git repos (maps URL -> local path).
+        #    The same walk yields the project dirs for the heart scan, whose
+        #    ripgrep pass runs alongside it.
+        #    Skipped entirely when neither consumer needs it.
+        heart_proc = self._start_heart_grep()
+        local_path_map, project_dirs = {}, set()
         if scan_local:
             logger.info("   🔍 Scanning local filesystem for git repos...")
-            local_path_map = self._scan_local_paths()
-            logger.info(f"   Found {len(local_path_map)} local git repos")
+        if scan_local or heart_proc is not None:
+            local_path_map, project_dirs = self._walk_workspaces(resolve_remotes=scan_local)
+        if scan_local:
+            logger.info("   Found %d local git repos", len(local_path_map))
         
         # 5. Scan heart integration (which local paths have federation_heart imports?)
-        heart_integration_map = self._scan_heart_integration()
-        logger.info(f"   💓 Heart integration: {len(heart_integration_map)} projects connected")
+        heart_integration_map = {}
+        if heart_proc is not None:
+            heart_integration_map = self._scan_heart_integration(project_dirs, heart_proc)
+        logger.info("   💓 Heart integration: %d projects connected", len(heart_integration_map))
         
         # 6. Iterate through CMP projects (MASTER LOOP)
         registry_projects = []
+        for cmp_proj in cmp_projects:
+            project = self._enrich_project(
+                cmp_proj, overrides_map, github_map, local_path_map,
+                heart_integration_map, exclusions
+            )
+            if project is not None:
+                registry_projects.append(project)
+        
         stats = {
             "total": 0, "github": 0, "local_only": 0, 
             "linked": 0, "cloud_only": 0, "local_snapshot": 0, "virtual": 0,
             "heart_connected": 0, "heart_disconnected": 0
         }
         
-        for cmp_proj in cmp_projects:
-            # Extract from CMP
-            uuid = str(cmp_proj['uuid'])  # Convert UUID to string for YAML serialization
-            name = cmp_proj['name']
-            key = cmp_proj.get('key', name)
-            github_url = cmp_proj.get('github_url')
-            domain = cmp_proj.get('domain')
-            proj_type = cmp_proj.get('type', 'PROJECT')
-            
-            # Check exclusions
-            if github_url and self._is_excluded(github_url, exclusions):
-                logger.debug(f"   Skipping excluded: {name}")
-                continue
-            
-            local_paths = []
-            notes = None
-            status = cmp_proj.get('status', 'active')
-            visibility = "private"
-            updated_at = None
-            
-            # A. Check Overrides (Highest Priority)
-            if github_url:
-                normalized_url = github_url.lower().rstrip('/')
-                
-                if normalized_url in overrides_map:
-                    override = overrides_map[normalized_url]
-                    if override.get('local_paths'):
-                        local_paths = override['local_paths']
-                    if override.get('notes'):
-                        notes = override['notes']
-                    if override.get('status'):
-                        status = override['status']
-            
-            # B. GitHub Enrichment (lookup repo metadata)
-            if github_url:
-                normalized_url = github_url.lower().rstrip('/')
-                
-                if normalized_url in github_map:
-                    github_repo = github_map[normalized_url]
-                    visibility = github_repo.get('visibility', 'private')
-                    updated_at = github_repo.get('updatedAt')
-                
-                # C. Local Path Enrichment (if not already from override)
-                if not local_paths and normalized_url in local_path_map:
-                    local_paths = [local_path_map[normalized_url]]
-            
-            # Heart integration check
-            heart_connected = False
-            heart_count = 0
-            for lp in local_paths:
-                # Relativize absolute paths to match heart_integration_map keys
-                try:
-                    lp_rel = str(
-                        Path(lp).relative_to(self.infra_root)
-                    ).replace("\\", "/").lower()
-                except ValueError:
-                    lp_rel = lp.replace("\\", "/").lower()
-                
-                if lp_rel in heart_integration_map:
-                    heart_connected = True
-                    heart_count = heart_integration_map[lp_rel]
-                    break
-            
-            # Build registry entry
-            project = RegistryProject(
-                uuid=uuid,
-                name=key,  # Use CMP key as canonical name
-                display_name=name,  # Use CMP name as display
-                github_url=github_url,
-                local_paths=local_paths,
-                classification=proj_type.lower(),
-                status=status,
-                origin="cmp_db",  # ALL entries come from CMP now
-                visibility=visibility,
-                updated_at=updated_at,
-                notes=notes,
-                heart_connected=heart_connected,
-                heart_import_count=heart_count
-            )
-            
-            registry_projects.append(project)
+        for project in registry_projects:
             stats["total"] += 1
             
             # Classification
-            if github_url:
+            if project.github_url:
                 stats["github"] += 1
             else:
                 stats["virtual"] += 1
             
-            if status == "snapshot":
+            if project.status == "snapshot":
                 stats["local_snapshot"] += 1
-            elif local_paths:
+            elif project.local_paths:
                 stats["linked"] += 1
-            elif github_url:
+            elif project.github_url:
                 stats["cloud_only"] += 1
             
-            if heart_connected:
+            if project.heart_connected:
                 stats["heart_connected"] += 1
-            elif local_paths:  # Only count disconnected if they have local paths
+            elif project.local_paths:  # Only count disconnected if they have local paths
                 stats["heart_disconnected"] += 1
         
         # 5. Optionally scan for local-only projects
-        if include_local_only:
+        if include_local_only and self._LOCAL_ONLY_IMPL:
             local_only = self._find_local_only_projects(
                 {p.github_url for p in registry_projects if p.github_url}
             )
@@ -267,9 +398,9 @@ class RegistryBuilder:
                 stats["total"] += 1
                 stats["local_only"] += 1
 
-        logger.info(f"   ✅ Registry built: {stats['total']} projects")
-        logger.info(f"      Linked: {stats['linked']} | Snapshot: {stats['local_snapshot']} | Cloud Only: {stats['cloud_only']}")
-        logger.info(f"      💓 Heart: {stats['heart_connected']} connected | {stats['heart_disconnected']} disconnected")
+        logger.info("   ✅ Registry built: %s projects", stats['total'])
+        logger.info("      Linked: %s | Snapshot: %s | Cloud Only: %s", stats['linked'], stats['local_snapshot'], stats['cloud_only'])
+        logger.info("      💓 Heart: %s connected | %s disconnected", stats['heart_connected'], stats['heart_disconnected'])
         
         return ProjectRegistry(
             version="1.0.0",
@@ -283,10 +414,11 @@ class RegistryBuilder:
         self,
         registry: ProjectRegistry,
         output_path: Optional[Path] = None,
-        force: bool = False
+        force: bool = False,
+        fmt: str = "yaml"
     ) -> Path:
         """
-        Save the registry to YAML file.
+        Save the registry to YAML and/or JSON file.
         
         GUARD: Refuses to overwrite with worse data unless force=True.
         
@@ -294,22 +426,36 @@ class RegistryBuilder:
             registry: The built registry
             output_path: Where to save (defaults to governance/registry/projects/)
             force: If True, overwrite even if new data is worse
+            fmt: "yaml", "json" (output_path with a .json suffix, for
+                 machine consumers) or "both"
             
         Returns:
-            Path to saved file
+            Path to saved file (the YAML file unless fmt="json")
         """
-        import yaml
+        if fmt not in ("yaml", "json", "both"):
+            raise ValueError(f"Unknown registry format: {fmt}")
+        yaml = _load_yaml()
         
         if output_path is None:
             output_path = self.settings.get_governance_path(
                 "registry/projects/PROJECT_REGISTRY_V1.yaml"
             )
+        json_path = output_path.with_suffix(".json")
+        primary_path = json_path if fmt == "json" else output_path
+        # Stats of the last save, so the guard needn't re-parse the registry
+        stats_path = output_path.with_name(f"{output_path.stem}.stats.json")
         
         # DEGRADATION GUARD: Don't nuke good data with empty data
-        if output_path.exists() and not force:
+        if primary_path.exists() and not force:
             try:
-                with open(output_path, 'r', encoding='utf-8') as f:
-                    existing = yaml.safe_load(f)
+                old_stats = _load_stats_sidecar(stats_path, primary_path)
+                if old_stats is not None:
+                    existing = {'stats': old_stats}
+                elif fmt == "json":
+                    with open(primary_path, 'r', encoding='utf-8') as f:
+                        existing = json.load(f)
+                else:
+                    existing = _load_registry_header(primary_path)
                 
                 old_linked = existing.get('stats', {}).get('linked', 0)
                 old_github = existing.get('stats', {}).get('github', 0)
@@ -319,9 +465,10 @@ class RegistryBuilder:
                 # If new registry has significantly fewer linked projects, REFUSE
                 if old_linked > 0 and new_linked == 0:
                     logger.error(
-                        f"   🚫 SAVE BLOCKED: New registry has 0 linked projects "
-                        f"but existing has {old_linked}. This looks like data loss. "
-                        f"Use force=True to override."
+                        "   🚫 SAVE BLOCKED: New registry has 0 linked projects "
+                        "but existing has %s. This looks like data loss. "
+                        "Use force=True to override.",
+                        old_linked
                     )
                     raise ValueError(
                         f"Degradation guard: old={old_linked} linked, new={new_linked} linked. "
@@ -330,52 +477,158 @@ class RegistryBuilder:
                 
                 if old_github > 5 and new_github < old_github * 0.5:
                     logger.warning(
-                        f"   ⚠️ New registry has {new_github} github projects "
-                        f"vs existing {old_github}. Possible data loss."
+                        "   ⚠️ New registry has %s github projects "
+                        "vs existing %s. Possible data loss.",
+                        new_github, old_github
                     )
-            except (yaml.YAMLError, TypeError, KeyError):
+            except (yaml.YAMLError, json.JSONDecodeError, TypeError, KeyError):
                 pass  # Existing file is corrupt, safe to overwrite
         
         output_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = registry.to_dict()
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            yaml.dump(
-                registry.to_dict(),
+        if fmt in ("yaml", "both"):
+            _write_atomic(output_path, lambda f: yaml.dump(
+                payload,
                 f,
+                Dumper=_YDumper,
                 default_flow_style=False,
                 allow_unicode=True,
                 sort_keys=False
-            )
+            ))
+            logger.info("   💾 Saved to: %s", output_path)
+        
+        if fmt in ("json", "both"):
+            _write_atomic(json_path, lambda f: f.write(_dumps_json(payload)), binary=True)
+            logger.info("   💾 Saved to: %s", json_path)
         
-        logger.info(f"   💾 Saved to: {output_path}")
-        return output_path
+        st = primary_path.stat()
+        _write_atomic(stats_path, lambda f: json.dump(
+            {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'stats': registry.stats},
+            f,
+            indent=2
+        ))
+        
+        return primary_path
     
     # =========================================================================
     # Private Helpers
     # =========================================================================
     
+    @staticmethod
+    def _norm_url(url: str) -> str:
+        """Normalize a GitHub URL into the key shared by every lookup map."""
+        return url.lower().rstrip('/')
+    
+    def _enrich_project(
+        self,
+        cmp_proj: Dict[str, Any],
+        overrides_map: Dict[str, Dict],
+        github_map: Dict[str, Dict[str, Any]],
+        local_path_map: Dict[str, str],
+        heart_integration_map: Dict[str, int],
+        exclusions: FrozenSet[str]
+    ) -> Optional[RegistryProject]:
+        """
+        Build the registry entry for one CMP project.
+        
+        Returns:
+            RegistryProject, or None if the project is excluded
+        """
+        # Extract from CMP
+        uuid = str(cmp_proj['uuid'])  # Convert UUID to string for YAML serialization
+        name = cmp_proj['name']
+        key = cmp_proj.get('key', name)
+        github_url = cmp_proj.get('github_url')
+        normalized_url = self._norm_url(github_url) if github_url else None
+        domain = cmp_proj.get('domain')
+        proj_type = cmp_proj.get('type', 'PROJECT')
+        
+        # Check exclusions
+        if self._is_excluded(normalized_url, exclusions):
+            logger.debug("   Skipping excluded: %s", name)
+            return None
+        
+        local_paths = []
+        notes = None
+        status = cmp_proj.get('status', 'active')
+        visibility = "private"
+        updated_at = None
+        
+        # A. Check Overrides (Highest Priority)
+        if github_url:
+            if normalized_url in overrides_map:
+                override = overrides_map[normalized_url]
+                if override.get('local_paths'):
+                    local_paths = list(override['local_paths'])  # Copy: overrides are cached
+                if override.get('notes'):
+                    notes = override['notes']
+                if override.get('status'):
+                    status = override['status']
+        
+        # B. GitHub Enrichment (lookup repo metadata)
+        if github_url:
+            if normalized_url in github_map:
+                github_repo = github_map[normalized_url]
+                visibility = github_repo.get('visibility', 'private')
+                updated_at = github_repo.get('updatedAt')
+            
+            # C. Local Path Enrichment (if not already from override)
+            if not local_paths and normalized_url in local_path_map:
+                local_paths = [local_path_map[normalized_url]]
+        
+        # Heart integration check
+        heart_connected = False
+        heart_count = 0
+        infra_prefix = self._infra_prefix
+        for lp in local_paths:
+            # Relativize absolute paths to match heart_integration_map keys
+            lp_rel = lp.replace("\\", "/").lower()
+            if lp_rel.startswith(infra_prefix):
+                lp_rel = lp_rel[len(infra_prefix):]
+            
+            if lp_rel in heart_integration_map:
+                heart_connected = True
+                heart_count = heart_integration_map[lp_rel]
+                break
+        
+        # Build registry entry. Low-cardinality columns are interned so
+        # every project shares one string object per distinct value.
+        return RegistryProject(
+            uuid=uuid,
+            name=key,  # Use CMP key as canonical name
+            display_name=name,  # Use CMP name as display
+            github_url=github_url,
+            local_paths=local_paths,
+            classification=_intern(proj_type.lower()),
+            status=_intern(status),
+            origin="cmp_db",  # ALL entries come from CMP now
+            visibility=_intern(visibility),
+            updated_at=updated_at,
+            notes=notes,
+            heart_connected=heart_connected,
+            heart_import_count=heart_count
+        )
+    
     def _load_github_inventory(self, path: Path) -> List[RepoInventoryItem]:
         """Load and deduplicate GitHub inventory."""
         if not path.exists():
-            logger.warning(f"   ⚠️ Inventory not found: {path}")
+            logger.warning("   ⚠️ Inventory not found: %s", path)
             return []
         
-        with open(path, 'r', encoding='utf-8') as f:
-            raw_data = json.load(f)
+        raw_data = _load_cached(path, _parse_json_file)
         
         # Handle list vs dict wrapper
         items = raw_data if isinstance(raw_data, list) else raw_data.get("projects", [])
         
-        # Deduplicate by URL
-        seen_urls = set()
-        unique = []
+        # Deduplicate by URL (first occurrence wins), then validate survivors only
+        unique: Dict[str, Dict[str, Any]] = {}
         for item in items:
             url = item.get('url', '').lower()
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                unique.append(RepoInventoryItem(**item))
+            if url and url not in unique:
+                unique[url] = item
         
-        return unique
+        return [RepoInventoryItem(**item) for item in unique.values()]
     
     def _load_github_inventory_as_map(self, path: Path) -> Dict[str, Dict[str, Any]]:
         """
@@ -385,8 +638,9 @@ class RegistryBuilder:
             Dict mapping {github_url_lowercase: repo_metadata}
         """
         repos = self._load_github_inventory(path)
+        norm_url = self._norm_url
         return {
-            repo.url.lower().rstrip('/'): {
+            norm_url(repo.url): {
                 'url': repo.url,
                 'name': repo.name,
                 'visibility': repo.visibility,
@@ -395,48 +649,40 @@ class RegistryBuilder:
             for repo in repos
         }
     
-    def _load_exclusions(self) -> List[str]:
+    def _load_exclusions(self) -> FrozenSet[str]:
         """
         Load EXCLUSION_LIST_V1.yaml.
         
         Returns:
-            List of repo names to exclude (lowercase)
+            Set of repo names to exclude (lowercase)
         """
         try:
-            import yaml
             exclusion_path = self.settings.get_governance_path(
                 "registry/projects/EXCLUSION_LIST_V1.yaml"
             )
             if not exclusion_path.exists():
-                return []
-            
-            with open(exclusion_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+                return frozenset()
             
-            exclusions = []
-            for item in data.get('exclusions', []):
-                repo_name = item.get('repo', '').lower()
-                if repo_name:
-                    exclusions.append(repo_name)
+            data = _load_cached(exclusion_path, _parse_yaml_file)
             
-            return exclusions
+            return frozenset(
+                repo_name
+                for repo_name in (item.get('repo', '').lower() for item in data.get('exclusions', []))
+                if repo_name
+            )
         except Exception as e:
-            logger.warning(f"   ⚠️ Failed to load exclusions: {e}")
-            return []
+            logger.warning("   ⚠️ Failed to load exclusions: %s", e)
+            return frozenset()
     
-    def _is_excluded(self, github_url: str, exclusions: List[str]) -> bool:
-        """Check if a GitHub URL matches any exclusion."""
-        if not github_url or not exclusions:
+    def _is_excluded(self, normalized_url: Optional[str], exclusions: FrozenSet[str]) -> bool:
+        """Check if a normalized GitHub URL (lowercase, no trailing '/') matches any exclusion."""
+        if not normalized_url or not exclusions:
             return False
         
         # Extract repo name from URL
-        # https://github.com/Kryssie6985/kiss -> kiss
-        parts = github_url.rstrip('/').split('/')
-        if len(parts) >= 2:
-            repo_name = parts[-1].lower()
-            return repo_name in exclusions
-        
-        return False
+        # https://github.com/kryssie6985/kiss -> kiss
+        _, sep, repo_name = normalized_url.rpartition('/')
+        return bool(sep) and repo_name in exclusions
     
     def _load_cmp_data(self) -> List[Dict[str, Any]]:
         """
@@ -451,14 +697,14 @@ class RegistryBuilder:
             result = scan(self.infra_root)
             items = result.get('items', [])
             if items:
-                logger.info(f"   📡 CMP live query returned {len(items)} projects")
+                logger.info("   📡 CMP live query returned %d projects", len(items))
                 return items
             else:
                 logger.warning("   ⚠️ CMP query returned 0 items")
         except ImportError:
             logger.info("   ℹ️ CMP scanner not found (Open Source Mode)")
         except Exception as e:
-            logger.warning(f"   ⚠️ CMP live query failed: {e}")
+            logger.warning("   ⚠️ CMP live query failed: %s", e)
         
         # FALLBACK: Use canonical_projects_uuids.json (cached CMP mirror)
         logger.info("   🔄 Falling back to canonical_projects_uuids.json")
@@ -483,8 +729,7 @@ class RegistryBuilder:
                 logger.error("   ❌ canonical_projects_uuids.json not found!")
                 return []
             
-            with open(canonical_path, 'r', encoding='utf-8') as f:
-                canonical = json.load(f)
+            canonical = _load_cached(canonical_path, _parse_json_file)
             
             # Transform canonical format to match CMP scanner output format
             projects = []
@@ -500,13 +745,13 @@ class RegistryBuilder:
                 })
             
             logger.info(
-                f"   ✅ Loaded {len(projects)} projects from canonical fallback "
-                f"({sum(1 for p in projects if p.get('github_url'))} with github_url)"
+                "   ✅ Loaded %d projects from canonical fallback (%d with github_url)",
+                len(projects), sum(1 for p in projects if p.get('github_url'))
             )
             return projects
             
         except Exception as e:
-            logger.error(f"   ❌ Canonical fallback also failed: {e}")
+            logger.error("   ❌ Canonical fallback also failed: %s", e)
             return []
     
     def _load_legacy_oracle(self) -> Dict[str, str]:
@@ -527,8 +772,7 @@ class RegistryBuilder:
                 logger.warning("   ⚠️ Canonical registry not found, run: python -m tools.omni.omni.core.canonical_uuid_builder")
                 return {}
             
-            with open(canonical_path, 'r', encoding='utf-8') as f:
-                canonical = json.load(f)
+            canonical = _load_cached(canonical_path, _parse_json_file)
             
             # Build name -> uuid mapping
             uuid_map = {}
@@ -542,11 +786,11 @@ class RegistryBuilder:
                 if key and key != name:
                     uuid_map[key] = uuid
             
-            logger.info(f"   📡 Loaded {len(uuid_map)} canonical UUIDs from CMP mirror")
+            logger.info("   📡 Loaded %d canonical UUIDs from CMP mirror", len(uuid_map))
             return uuid_map
             
         except Exception as e:
-            logger.warning(f"   ⚠️ Failed to load canonical oracle: {e}")
+            logger.warning("   ⚠️ Failed to load canonical oracle: %s", e)
             return {}
     
     def _load_overrides(self) -> Dict[str, Dict]:
@@ -555,18 +799,16 @@ class RegistryBuilder:
         Handles aliases by duplicating the override entry for each alias key.
         """
         try:
-            import yaml
             path = self.settings.get_registry_overrides_path()
             if not path.exists():
                 return {}
             
-            with open(path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+            data = _load_cached(path, _parse_yaml_file)
             
             overrides = {}
             for item in data.get('overrides', []):
                 # Normalize canonical URL
-                url = item.get('github_url', '').lower().rstrip('/')
+                url = self._norm_url(item.get('github_url', ''))
                 if not url:
                     continue
                 
@@ -575,126 +817,160 @@ class RegistryBuilder:
                 
                 # Store alias entries pointing to same data
                 for alias in item.get('aliases', []):
-                    alias_url = alias.lower().rstrip('/')
+                    alias_url = self._norm_url(alias)
                     overrides[alias_url] = item  # Point alias to same override config
             
             return overrides
             
         except Exception as e:
-            logger.warning(f"   ⚠️ Failed to load overrides: {e}")
+            logger.warning("   ⚠️ Failed to load overrides: %s", e)
             return {}
 
-    def _scan_heart_integration(self) -> Dict[str, int]:
+    def _walk_workspaces(self, resolve_remotes: bool = True) -> Tuple[Dict[str, str], Set[str]]:
         """
-        Scan which project directories contain federation_heart imports.
+        Walk every workspace root once for git repos.
         
-        Uses ripgrep for speed. Maps project local_path -> import count.
+        Feeds both the local path map and the heart integration scan, so the
+        filesystem is enumerated a single time per build.
+        
+        Args:
+            resolve_remotes: Whether to read each repo's origin URL (one git
+                             call per repo); skipped when only project dirs are needed
         
         Returns:
-            Dict of { 'local_path_lowercase_fwd_slash': import_file_count }
+            ({ normalized_github_url: 'local_path' } (see _norm_url; first found wins),
+             { 'repo_dir_relative_to_infra_lowercase_fwd_slash' })
         """
+        url_to_path: Dict[str, str] = {}
+        project_dirs: Set[str] = set()
         try:
-            from omni.lib.files import walk_project
-            # Naive python scan if rg is missing, or just rely on what we have.
-            # actually, let's keep it simple for now. 
-            # If we don't have rg, we might skip this heavily intensive task in python
-            
-            # Check if rg is available
-            import shutil
-            if not shutil.which("rg"):
-                logger.info("   ℹ️ 'rg' (ripgrep) not found - skipping deep integration scan.")
-                return {}
-
-            result = subprocess.run(
-                ["rg", "-l", "--no-ignore", "-g", "*.py",
-                 "from federation_heart", str(self.infra_root)],
-                capture_output=True, encoding="utf-8", errors="replace",
-                timeout=30
-            )
-            
-            if result.returncode not in (0, 1):  # 1 = no matches (fine)
-                logger.debug(f"   ripgrep returned code {result.returncode}")
-                return {}
-            
-            # Collect all files that import federation_heart
-            heart_files = []
-            for line in result.stdout.strip().split("\n"):
-                line = line.strip()
-                if line:
-                    try:
-                        rel = str(
-                            Path(line).relative_to(self.infra_root)
-                        ).replace("\\", "/").lower()
-                        heart_files.append(rel)
-                    except ValueError:
-                        pass
-            
-            # Now load the registry's known local_paths to map files -> projects
-            # ... rest of logic ...
-            
-            # Get all workspace roots
+            # Get all workspace roots (respects USER_MANIFEST_V1.yaml)
             try:
                 from omni.config.settings import get_all_workspaces
                 scan_roots = get_all_workspaces()
             except ImportError:
-                 from omni.config import settings
-                 scan_roots = [settings.get_infrastructure_root()] # Fallback
+                scan_roots = [self.infra_root]  # Fallback
+            
+            from omni.scanners.git.git_util import find_git_repos, map_remote_urls
             
-            # Find all git repos to build a path -> project_dir map
-            from omni.scanners.git.git import _find_git_repos
-            project_dirs = set()
+            repos = []
             for root in scan_roots:
                 if root.exists():
-                    for repo_path in _find_git_repos(root):
-                        try:
-                            rel = str(
-                                repo_path.relative_to(self.infra_root)
-                            ).replace("\\", "/").lower()
-                            project_dirs.add(rel)
-                        except ValueError:
-                            pass
-            
-            # Map: for each project dir, count how many heart-importing files it contains
-            path_to_count: Dict[str, int] = {}
-            for hf in heart_files:
-                # Skip federation_heart itself — it IS the heart
-                if hf.startswith("federation_heart/"):
-                    continue
-                    
-                # Find the longest matching project dir
-                best_dir = None
-                best_len = 0
-                for pd in project_dirs:
-                    if hf.startswith(pd + "/") and len(pd) > best_len:
-                        best_dir = pd
-                        best_len = len(pd)
-                
-                if best_dir:
-                    path_to_count[best_dir] = path_to_count.get(best_dir, 0) + 1
+                    repos.extend(find_git_repos(root))
             
-            logger.info(f"   🔍 Heart scan: {len(heart_files)} files import Heart, across {len(path_to_count)} project dirs")
-            return path_to_count
+            infra_prefix = self._infra_prefix
+            for repo_dir in repos:
+                rel = str(repo_dir).replace("\\", "/").lower()
+                if rel.startswith(infra_prefix):
+                    project_dirs.add(rel[len(infra_prefix):])
             
-        except ImportError:
-             logger.warning("   ⚠️ Required modules for heart scan not found.")
-             return {}
+            if resolve_remotes:
+                for remote_url, local_path in map_remote_urls(repos).items():
+                    url_to_path.setdefault(self._norm_url(remote_url), local_path)
         except Exception as e:
-            logger.warning(f"   ⚠️ Heart integration scan failed: {e}")
-            return {}
-
-    def _scan_local_paths(self) -> Dict[str, str]:
+            logger.warning("   ⚠️ Failed to scan local paths: %s", e)
+        
+        return url_to_path, project_dirs
+    
+    def _start_heart_grep(self) -> Optional[subprocess.Popen]:
+        """
+        Start ripgrep listing the .py files that import federation_heart.
+        
+        Started before the workspace walk so both run concurrently; the
+        output is consumed line by line in _scan_heart_integration.
+        
+        Returns:
+            The running process, or None if ripgrep is unavailable
         """
-        Scan local filesystem for git repos and map GitHub URLs to paths.
+        import shutil
+        if not shutil.which("rg"):
+            logger.info("   ℹ️ 'rg' (ripgrep) not found - skipping deep integration scan.")
+            return None
+        
+        # One pattern covers both `from federation_heart...` and
+        # `import federation_heart...` so a single walk finds every importer.
+        try:
+            return subprocess.Popen(
+                ["rg", "-l", "--no-ignore", "-g", "*.py",
+                 "-e", HEART_IMPORT_PATTERN, str(self.infra_root)],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                encoding="utf-8", errors="replace"
+            )
+        except OSError as e:
+            logger.warning("   ⚠️ Heart integration scan failed: %s", e)
+            return None
+    
+    def _scan_heart_integration(
+        self,
+        project_dirs: Optional[Set[str]] = None,
+        proc: Optional[subprocess.Popen] = None
+    ) -> Dict[str, int]:
+        """
+        Scan which project directories contain federation_heart imports.
+        
+        Uses ripgrep for speed. Maps project local_path -> import count.
+        
+        Args:
+            project_dirs: Repo dirs from _walk_workspaces (walked here if None)
+            proc: Process from _start_heart_grep (started here if None)
         
         Returns:
-            Dict of { 'github_url_lowercase': 'local_path' }
+            Dict of { 'local_path_lowercase_fwd_slash': import_file_count }
         """
+        if proc is None:
+            proc = self._start_heart_grep()
+            if proc is None:
+                return {}
+        
+        watchdog = threading.Timer(RG_TIMEOUT_SECONDS, proc.kill)
+        watchdog.start()
         try:
-            from omni.scanners.git.git import scan_local_paths
-            return scan_local_paths()
+            if project_dirs is None:
+                project_dirs = self._walk_workspaces(resolve_remotes=False)[1]
+            
+            # Map: for each project dir, count how many heart-importing files it contains
+            path_to_count: Dict[str, int] = Counter()
+            heart_file_count = 0
+            infra_prefix = self._infra_prefix
+            infra_prefix_len = len(infra_prefix)
+            for line in proc.stdout:
+                hf = line.strip().replace("\\", "/").lower()
+                if not hf.startswith(infra_prefix):
+                    continue
+                hf = hf[infra_prefix_len:]
+                heart_file_count += 1
+                
+                # Skip federation_heart itself — it IS the heart
+                if hf.startswith("federation_heart/"):
+                    continue
+                
+                # Find the longest matching project dir by probing the file's
+                # ancestor dirs (deepest first) - O(path depth), not O(project_dirs)
+                cut = hf.rfind("/")
+                while cut > 0:
+                    best_dir = hf[:cut]
+                    if best_dir in project_dirs:
+                        path_to_count[best_dir] += 1
+                        break
+                    cut = hf.rfind("/", 0, cut)
+            
+            returncode = proc.wait()
         except Exception as e:
-            logger.warning(f"   ⚠️ Failed to scan local paths: {e}")
+            logger.warning("   ⚠️ Heart integration scan failed: %s", e)
             return {}
+        finally:
+            watchdog.cancel()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+        
+        if returncode not in (0, 1):  # 1 = no matches (fine)
+            logger.debug("   ripgrep returned code %s", returncode)
+            return {}
+        
+        logger.info("   🔍 Heart scan: %s files import Heart, across %d project dirs", heart_file_count, len(path_to_count))
+        return path_to_count
     
     def _find_local_only_projects(
         self,
@@ -709,7 +985,8 @@ class RegistryBuilder:
 def build_registry(
     inventory_path: Optional[Path] = None,
     output_path: Optional[Path] = None,
-    include_local_only: bool = True
+    include_local_only: bool = True,
+    fmt: str = "yaml"
 ) -> Path:
     """
     Convenience function to build and save registry.
@@ -718,4 +995,4 @@ def build_registry(
     """
     builder = RegistryBuilder()
     registry = builder.build(inventory_path, include_local_only)
-    return builder.save(registry, output_path)
+    return builder.save(registry, output_path, fmt=fmt)
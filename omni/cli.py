@@ -6,10 +6,10 @@ import argparse
 import sys
 import os
 import json
-import yaml # Added for report dumping
 from pathlib import Path
 from datetime import datetime
 from dataclasses import asdict
+from functools import lru_cache
 
 # Force UTF-8 for Windows console
 if sys.platform == "win32":
@@ -21,24 +21,35 @@ if sys.platform == "win32":
 # 1. federation_heart/constitution/env_client.py (for federation env)
 # 2. fetcher.py (ONLY when actually scanning CMP database)
 
-from omni.lib import io
-from omni.core import gate
-from omni.scanners import SCANNERS
-from omni.core.model import ScanResult
+# Scanners, YAML and the scan model are imported inside the commands that use
+# them, so --version/--help and unrelated commands skip loading all of them.
 
 __version__ = "0.5.0"
 __author__ = "Kode_Animator"
 
-# Resolve Artifacts Root relative to this script
-OMNI_ROOT = Path(__file__).parent.resolve()
-ARTIFACTS_DIR = OMNI_ROOT.parent / "artifacts" / "omni"
+# Roots are resolved relative to this script on first use: resolve() walks
+# symlinks, and --version/--help never need them
+@lru_cache(maxsize=1)
+def _omni_root() -> Path:
+    """The omni package directory, symlinks resolved."""
+    return Path(__file__).parent.resolve()
 
-# Governance Registry paths (where registries should be output)
-INFRA_ROOT = OMNI_ROOT.parent.parent  # Infrastructure root
-REGISTRY_ROOT = INFRA_ROOT / "governance" / "registry"
+@lru_cache(maxsize=1)
+def _artifacts_dir() -> Path:
+    """Artifacts Root (artifacts/omni next to the package)."""
+    return _omni_root().parent / "artifacts" / "omni"
+
+@lru_cache(maxsize=1)
+def _registry_root() -> Path:
+    """Governance Registry path (where registries should be output), under the Infrastructure root."""
+    return _omni_root().parent.parent / "governance" / "registry"
 
 def cmd_scan(args):
     """Run scanners on a target."""
+    from omni.lib import io
+    from omni.scanners import SCANNERS
+    from omni.core.model import ScanResult
+    
     results = {}
     targets = []
     
@@ -72,13 +83,13 @@ def cmd_scan(args):
         print("   Usage: omni scan --all --scanners=surfaces")
         return
 
+    # Drop missing targets once here rather than re-stat'ing them per scanner
+    targets = [t for t in targets if os.path.exists(t)]
+
     # Determine Active Scanners
     if args.scanners:
-        wanted = args.scanners.split(',')
-        active_scanners = []
-        for k, v in SCANNERS.items():
-            if k in wanted:
-                active_scanners.append((k, v))
+        wanted = set(args.scanners.split(','))
+        active_scanners = [(k, v) for k, v in SCANNERS.items() if k in wanted]
     else:
         active_scanners = list(SCANNERS.items())
 
@@ -108,7 +119,6 @@ def cmd_scan(args):
         # Loop Targets
         count = 0
         for t in targets:
-            if not t.exists(): continue
             try:
                 # Simple progress for multi-target
                 if len(targets) > 1 and count % 5 == 0:
@@ -152,9 +162,17 @@ def cmd_scan(args):
     summary = {}
     if 'surfaces' in results:
         items = results['surfaces'].get('items', [])
-        missing = sum(1 for s in items if s.get('status') == 'missing' and s.get('scope') != 'external_reference')
-        partial = sum(1 for s in items if s.get('status') == 'partial')
-        exists = sum(1 for s in items if s.get('status') == 'exists')
+        # One pass over the surfaces for all three status counts
+        missing = partial = exists = 0
+        for s in items:
+            status = s.get('status')
+            if status == 'missing':
+                if s.get('scope') != 'external_reference':
+                    missing += 1
+            elif status == 'partial':
+                partial += 1
+            elif status == 'exists':
+                exists += 1
         
         summary['surfaces'] = {
             "total": len(items),
@@ -247,22 +265,30 @@ def cmd_scan(args):
     from omni.lib import artifacts
     output_path = artifacts.get_scan_path(scanner=scanner_name, scope=scope)
     
-    io.save_scan(scan_data, output_path)
+    # asdict() deep-copies every finding: convert once for the report, log and summary
+    scan_dict = scan_data.to_dict()
+    
+    io.save_scan(scan_dict, output_path)
     print(f"\n[REPORT] Saved to: {output_path}")
     
-    save_log(scan_data, output_path.with_name("scan_debug.log"))
+    save_log(scan_dict, output_path.with_name("scan_debug.log"), pretty=getattr(args, 'pretty_log', False))
     
     # 4. Final Summary
-    _print_summary(scan_data, args.top, verbosity=args.verbosity)
+    _print_summary(scan_dict, args.top, verbosity=args.verbosity)
 
-def save_log(scan_data: ScanResult, path: Path):
-    """Save full debug log."""
+def save_log(data: dict, path: Path, pretty: bool = False):
+    """
+    Save full debug log (data is ScanResult.to_dict()).
+    Streamed to disk instead of built as one string; compact unless pretty.
+    """
     with open(path, "w", encoding="utf-8") as f:
-        f.write(json.dumps(scan_data.to_dict(), indent=2))
+        if pretty:
+            json.dump(data, f, indent=2)
+        else:
+            json.dump(data, f, separators=(",", ":"))
 
-def _print_summary(scan_data: ScanResult, top: int = None, verbosity: str = "default"):
-    """Print a human-readable summary to stdout."""
-    data = scan_data.to_dict()
+def _print_summary(data: dict, top: int = None, verbosity: str = "default"):
+    """Print a human-readable summary to stdout (data is ScanResult.to_dict())."""
     findings = data.get("findings", {})
     
     print("\n" + "="*40)
@@ -501,6 +527,9 @@ def cmd_inspect(args):
 
 def cmd_gate(args):
     """Enforce quality gates based on scan results."""
+    from omni.lib import io
+    from omni.core import gate
+    
     scan_file = Path(args.from_file)
     if not scan_file.exists():
         print(f"❌ Scan file not found: {scan_file}")
@@ -760,7 +789,7 @@ def cmd_library(args):
     
     if args.library_command == "curate":
         # Load census
-        census_file = Path(args.census) if args.census else ARTIFACTS_DIR / "scan.library.json"
+        census_file = Path(args.census) if args.census else _artifacts_dir() / "scan.library.json"
         if not census_file.exists():
             print(f"❌ Census file not found: {census_file}")
             print("   Run 'omni scan library' first to generate census.")
@@ -776,7 +805,7 @@ def cmd_library(args):
             return
         
         # Load taxonomy
-        taxonomy_file = OMNI_ROOT / "templates" / "library_taxonomy.yaml"
+        taxonomy_file = _omni_root() / "templates" / "library_taxonomy.yaml"
         if not taxonomy_file.exists():
              print(f"❌ Taxonomy template not found: {taxonomy_file}")
              return
@@ -812,7 +841,7 @@ def cmd_library(args):
                     filename = "INSTRUCTION_REGISTRY_V1.yaml"
                     print(f"[AUTO-DETECT] Domain: Infrastructure → {filename}")
                 
-                output_path = REGISTRY_ROOT / "instructions" / filename
+                output_path = _registry_root() / "instructions" / filename
             else:
                 output_path = Path(args.output)
             
@@ -831,7 +860,7 @@ def cmd_library(args):
                 "entries": [asdict(e) for e in entries]
             }
             
-            output_path = Path(args.output) if args.output else ARTIFACTS_DIR / "library_manifest.json"
+            output_path = Path(args.output) if args.output else _artifacts_dir() / "library_manifest.json"
             output_path.parent.mkdir(parents=True, exist_ok=True)
             
             with output_path.open("w", encoding="utf-8") as f:
@@ -875,7 +904,7 @@ def cmd_interpret(args):
         cmd_scan(scan_args)
         
         # Load the generated scan file
-        scan_file = ARTIFACTS_DIR / "scan.json"
+        scan_file = _artifacts_dir() / "scan.json"
         if not scan_file.exists():
             print("❌ Scan failed to generate results")
             return
@@ -932,15 +961,16 @@ def cmd_registry_events(args):
 
 def cmd_report(args):
     """Generate reports."""
+    import yaml
     from omni.core import reporting
     # Resolve paths
     # We default input to where we usually save registry
     # Try multiple spots
     possible_inputs = [
         Path(args.input) if args.input else None,
-        REGISTRY_ROOT / "events" / "EVENT_REGISTRY.yaml",  # Canonical location
+        _registry_root() / "events" / "EVENT_REGISTRY.yaml",  # Canonical location
         Path("EVENT_REGISTRY.yaml"),  # CWD fallback
-        ARTIFACTS_DIR / "EVENT_REGISTRY.yaml"  # Legacy fallback
+        _artifacts_dir() / "EVENT_REGISTRY.yaml"  # Legacy fallback
     ]
     
     registry_path = None
@@ -987,12 +1017,7 @@ def cmd_report(args):
              print(f"  [WARN] {report['error']}")
 
 
-def main():
-    parser = argparse.ArgumentParser(prog="omni", description="Federation Governance Tricorder")
-    parser.add_argument("--version", action="version", version=f"omni {__version__}")
-    
-    subparsers = parser.add_subparsers(dest="command", required=True)
-
+def _build_scan(subparsers):
     # SCAN
     p_scan = subparsers.add_parser("scan", help="Scan a target for surfaces and health")
     p_scan.add_argument("target", nargs="?", default=".", help="Target directory (default: current dir)")
@@ -1001,6 +1026,7 @@ def main():
     p_scan.add_argument("--format", choices=["json", "summary"], default="summary", help="Output format (default: summary)")
     p_scan.add_argument("--top", type=int, help="Limit output to top N items")
     p_scan.add_argument("--scanners", help="Comma-separated list of scanners to run (e.g. 'events,surfaces')")
+    p_scan.add_argument("--pretty-log", action="store_true", help="Indent scan_debug.log for reading (default: compact)")
     
     # Canon scanner specific flags
     p_scan.add_argument("--canon-source", action="store_true", help="(canon scanner) Scan YAML front matter instead of canon.lock")
@@ -1020,29 +1046,34 @@ def main():
     p_scan.add_argument("--debug", dest="verbosity", action="store_const", const="debug", help="Debug output")
     p_scan.set_defaults(func=cmd_scan, verbosity="default")
 
+def _build_inspect(subparsers):
     # INSPECT
     p_inspect = subparsers.add_parser("inspect", help="Deep inspection of a path")
     p_inspect.add_argument("path", help="Path to inspect")
     p_inspect.set_defaults(func=cmd_inspect)
 
+def _build_introspect(subparsers):
     # INTROSPECT (Self-scan)
     p_introspect = subparsers.add_parser("introspect", help="Omni examines itself (scanners, commands, drift)")
     p_introspect.add_argument("--drift", action="store_true", help="Show drift between manifests and filesystem")
     p_introspect.add_argument("--scanners", dest="scanners_only", action="store_true", help="Show scanner inventory only")
     p_introspect.set_defaults(func=cmd_introspect)
 
+def _build_gate(subparsers):
     # GATE
     p_gate = subparsers.add_parser("gate", help="Enforce quality gates")
-    p_gate.add_argument("--from", dest="from_file", default=str(ARTIFACTS_DIR / "scan.json"), help="Input scan file")
+    p_gate.add_argument("--from", dest="from_file", default=str(_artifacts_dir() / "scan.json"), help="Input scan file")
     p_gate.add_argument("--strict", action="store_true", help="Fail on any partial/warning")
     p_gate.set_defaults(func=cmd_gate)
 
+def _build_init(subparsers):
     # INIT
     p_init = subparsers.add_parser("init", help="Scaffold templates")
     p_init.add_argument("type", choices=["contract", "openapi"], help="Template type")
     p_init.add_argument("--force", action="store_true", help="Overwrite existing files")
     p_init.set_defaults(func=cmd_init)
 
+def _build_audit(subparsers):
     # AUDIT
     p_audit = subparsers.add_parser("audit", help="Run audit tools")
     sp_audit = p_audit.add_subparsers(dest="audit_command", required=True)
@@ -1073,6 +1104,7 @@ def main():
     p_audit_install.add_argument("-f", "--file", default="requirements.federation.locked.txt", help="Requirements file")
     p_audit_install.set_defaults(func=cmd_audit_install)
 
+def _build_canon(subparsers):
     # CANON (Science Officer - Build The Law)
     p_canon = subparsers.add_parser("canon", help="Canon lock management (Build The Law)")
     sp_canon = p_canon.add_subparsers(dest="canon_action", required=True)
@@ -1099,6 +1131,7 @@ def main():
     p_canon_hash = sp_canon.add_parser("hash", help="Print SHA-256 hashes of all canon locks")
     p_canon_hash.set_defaults(func=cmd_canon)
 
+def _build_registry(subparsers):
     # REGISTRY
     p_reg = subparsers.add_parser("registry", help="Registry management tools")
     sp_reg = p_reg.add_subparsers(dest="registry_command", required=True)
@@ -1120,10 +1153,11 @@ def main():
     
     # registry events
     p_reg_events = sp_reg.add_parser("events", help="Generate Event Registry from scan")
-    p_reg_events.add_argument("-o", "--output", default=str(REGISTRY_ROOT / "events" / "EVENT_REGISTRY.yaml"), help="Output file")
+    p_reg_events.add_argument("-o", "--output", default=str(_registry_root() / "events" / "EVENT_REGISTRY.yaml"), help="Output file")
     p_reg_events.add_argument("--scan-file", help="Input scan file (default: auto-detect)")
     p_reg_events.set_defaults(func=cmd_registry_events)
 
+def _build_library(subparsers):
     # LIBRARY (Grand Librarian)
     p_lib = subparsers.add_parser("library", help="Grand Librarian - Taxonomy-aware documentation curation")
     sp_lib = p_lib.add_subparsers(dest="library_command", required=True)
@@ -1141,7 +1175,8 @@ def main():
     p_lib_org.add_argument("--target", required=True, help="Target root directory")
     p_lib_org.add_argument("--dry-run", action="store_true", help="Simulate without moving files")
     p_lib_org.set_defaults(func=cmd_library)
-    
+
+def _build_interpret(subparsers):
     # INTERPRET (Omni Brain)
     p_interpret = subparsers.add_parser("interpret", help="AI-powered analysis of scan results (Science Officer mode)")
     p_interpret.add_argument("target", nargs="?", default=".", help="Target to scan (if no input file)")
@@ -1149,33 +1184,67 @@ def main():
     p_interpret.add_argument("--scanners", help="Scanners to run (if no input file)")
     p_interpret.add_argument("--query", "-q", help="Custom analysis prompt")
     p_interpret.set_defaults(func=cmd_interpret)
-    
+
+def _build_map(subparsers):
     # MAP
     p_map = subparsers.add_parser("map", help="Ecosystem Cartography")
     p_map.add_argument("--root", default=str(Path.cwd().parent.parent), help="Root to map") # Default to user root?
     p_map.add_argument("action", choices=['analyze', 'guide', 'visualize'], default='analyze', nargs='?')
     p_map.set_defaults(func=cmd_map_ecosystem)
 
+def _build_report(subparsers):
     # REPORT
     p_rep = subparsers.add_parser("report", help="Generate reports")
     p_rep.add_argument("--type", choices=['event_debt', 'gap_analysis'], required=True, help="Report type")
     p_rep.add_argument("--input", help="Input file (Registry or Logs depending on context)")
-    p_rep.add_argument("-o", "--output", default=str(ARTIFACTS_DIR / "report.yaml"), help="Output file")
+    p_rep.add_argument("-o", "--output", default=str(_artifacts_dir() / "report.yaml"), help="Output file")
     p_rep.set_defaults(func=cmd_report)
-    
+
+def _build_compare_events(subparsers):
     # COMPARE EVENTS (Alias)
     p_cmp = subparsers.add_parser("compare-events", help="Compare Static Registry vs Dynamic Logs")
-    p_cmp.add_argument("-o", "--output", default=str(ARTIFACTS_DIR / "event_gap_analysis.yaml"), help="Output file")
+    p_cmp.add_argument("-o", "--output", default=str(_artifacts_dir() / "event_gap_analysis.yaml"), help="Output file")
     p_cmp.set_defaults(func=lambda args: cmd_report(argparse.Namespace(type='gap_analysis', input=None, output=args.output)))
 
-    # TREE (under INSPECT)
-
+def _build_tree(subparsers):
     # TREE (under INSPECT)
     p_tree = subparsers.add_parser("tree", help="Generate clean directory tree")
     p_tree.add_argument("root", nargs="?", default=".", help="Root to graph")
     p_tree.add_argument("-o", "--output", default="tree.md", help="Output file")
     p_tree.set_defaults(func=cmd_inspect_tree)
 
+# Command name → subparser builder (listing order = help order)
+_COMMAND_BUILDERS = {
+    "scan": _build_scan,
+    "inspect": _build_inspect,
+    "introspect": _build_introspect,
+    "gate": _build_gate,
+    "init": _build_init,
+    "audit": _build_audit,
+    "canon": _build_canon,
+    "registry": _build_registry,
+    "library": _build_library,
+    "interpret": _build_interpret,
+    "map": _build_map,
+    "report": _build_report,
+    "compare-events": _build_compare_events,
+    "tree": _build_tree,
+}
+
+def main():
+    parser = argparse.ArgumentParser(prog="omni", description="Federation Governance Tricorder")
+    parser.add_argument("--version", action="version", version=f"omni {__version__}")
+    
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    # Only build the invoked command's parser; all of them for help/unknown input
+    wanted = sys.argv[1] if len(sys.argv) > 1 else None
+    if wanted in _COMMAND_BUILDERS:
+        _COMMAND_BUILDERS[wanted](subparsers)
+    else:
+        for build in _COMMAND_BUILDERS.values():
+            build(subparsers)
+
     args = parser.parse_args()
     args.func(args)
 
@@ -1,5 +1,6 @@
 import json
 from pathlib import Path
+from typing import Union
 from uuid import UUID
 from omni.core.model import ScanResult
 
@@ -10,10 +11,12 @@ class UUIDEncoder(json.JSONEncoder):
             return str(obj)
         return super().default(obj)
 
-def save_scan(result: ScanResult, path: Path):
+def save_scan(result: Union[ScanResult, dict], path: Path):
+    """Write a scan as JSON; pass result.to_dict() when the caller already has it."""
+    data = result.to_dict() if isinstance(result, ScanResult) else result
     path.parent.mkdir(parents=True, exist_ok=True)
     with open(path, 'w') as f:
-        json.dump(result.to_dict(), f, indent=2, cls=UUIDEncoder)
+        json.dump(data, f, indent=2, cls=UUIDEncoder)
 
 def load_scan(path: Path) -> dict:
     with open(path, 'r') as f:
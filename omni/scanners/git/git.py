@@ -211,7 +211,7 @@ def scan_github(update_registry: bool = True) -> Dict[str, Any]:
 
 
 
-from omni.scanners.git.git_util import get_remote_url, find_git_repos
+from omni.scanners.git.git_util import find_git_repos, map_remote_urls
 
 
 def scan_local_paths(scan_roots: Optional[List[Path]] = None) -> Dict[str, str]:
@@ -237,22 +237,12 @@ def scan_local_paths(scan_roots: Optional[List[Path]] = None) -> Dict[str, str]:
             from omni.config import settings
             scan_roots = [settings.get_infrastructure_root()]
     
-    url_to_path = {}
-    
+    repos = []
     for root in scan_roots:
-        if not root.exists():
-            continue
-            
-        repos = find_git_repos(root)
-        
-        for repo_path in repos:
-            remote_url = get_remote_url(repo_path)
-            if remote_url:
-                # Store the mapping (first found wins)
-                if remote_url not in url_to_path:
-                    url_to_path[remote_url] = str(repo_path)
+        if root.exists():
+            repos.extend(find_git_repos(root))
     
-    return url_to_path
+    return map_remote_urls(repos)
 
 
 def _get_repo_status(repo_path: Path) -> Dict[str, Any]:
@@ -3,10 +3,11 @@ Git Utility Library
 ===================
 Shared logic for git operations to prevent duplication across scanners.
 """
+import os
 import subprocess
 import shutil
 from pathlib import Path
-from typing import Optional, List, Tuple, Dict
+from typing import Iterable, Optional, List, Tuple, Dict
 
 def run_git_command(
     repo_path: Path, 
@@ -74,35 +75,52 @@ def get_remote_url(repo_path: Path) -> Optional[str]:
 
 def find_git_repos(root: Path) -> List[Path]:
     """
-    Find all git repositories under target.
-    Skips nested .git directories.
+    Find all git repositories under target (nested repos included).
+    Never descends into .git, excluded or symlinked directories.
     """
-    repos = []
     # Use standard excludes from omni.lib.files if available, else basic list
     try:
-        from omni.lib.files import is_excluded
+        from omni.lib.files import DEFAULT_EXCLUDES as excludes
     except ImportError:
-        is_excluded = lambda p: False
-
-    for item in root.rglob(".git"):
-        if not item.is_dir():
-            continue
-            
-        repo_path = item.parent
-        
-        # Check standard excludes for the PARENT path
-        if is_excluded(repo_path):
-             continue
-
-        # Skip inception: .git inside .git (very rare but possible in messy worktrees)
+        excludes = {".git"}
+    
+    # Roots under an excluded directory hold nothing but excluded repos
+    if not excludes.isdisjoint(root.parts):
+        return []
+    
+    repos = []
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        subdirs = []
+        is_repo = False
         try:
-            # simple check: if any part of the relative path is .git (except the end)
-            rel = repo_path.relative_to(root)
-            if ".git" in rel.parts:
-                continue
-        except ValueError:
-            pass
-
-        repos.append(repo_path)
+            with os.scandir(current) as it:
+                for entry in it:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    if entry.name == ".git":
+                        is_repo = True
+                    elif entry.name not in excludes:
+                        subdirs.append(entry.path)
+        except OSError:
+            continue
+        if is_repo:
+            repos.append(Path(current))
+        stack.extend(reversed(subdirs))
     
     return repos
+
+def map_remote_urls(repos: Iterable[Path]) -> Dict[str, str]:
+    """
+    Map each repo's GitHub origin URL to its local path.
+    
+    Returns:
+        Dict of { 'github_url_lowercase': 'local_path' } (first found wins)
+    """
+    url_to_path = {}
+    for repo_path in repos:
+        remote_url = get_remote_url(repo_path)
+        if remote_url and remote_url not in url_to_path:
+            url_to_path[remote_url] = str(repo_path)
+    return url_to_path
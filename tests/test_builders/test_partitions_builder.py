@@ -0,0 +1,18 @@
+"""Round-trip tests for the native partitions lock emitter."""
+import pytest
+import yaml
+
+from omni.builders.codecraft.partitions_builder import _yaml_scalar
+
+
+@pytest.mark.parametrize("text", [
+    "a\x7fb",
+    "c\x9fd",
+    "e\ufffef",
+    "g\uffffh",
+    "line\x85break",
+    "tab\there",
+    "ünïcödé ✨ title",
+])
+def test_yaml_scalar_round_trips_through_safe_load(text):
+    assert yaml.safe_load(f"title: {_yaml_scalar(text)}\n") == {"title": text}